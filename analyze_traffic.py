@@ -1,22 +1,75 @@
 #!/usr/bin/env python3
 import argparse
+import contextlib
+import heapq
+import io
 import json
+import multiprocessing
 import os
 import re
 import subprocess
 import sys
-from collections import Counter, deque
+from array import array
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta, timezone
-from urllib.parse import parse_qs, urlparse
+from functools import lru_cache
+from itertools import islice
+from operator import add, itemgetter
+from urllib.parse import unquote_plus, urlparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 LOG_FILES = ["/var/log/nginx/web-ceo.access.log", "/var/log/nginx/web-ceo.access.log.1"]
+PARALLEL_PARSE_BATCH_LINES = 20000
 LOG_PATTERN = re.compile(
     r'^(?P<ip>\S+) \S+ \S+ \[(?P<ts>[^\]]+)\] "(?P<req>[^"]*)" (?P<status>\d{3}) \S+ "(?P<ref>[^"]*)" "(?P<ua>[^"]*)"'
 )
+NGINX_TIMESTAMP_PATTERN = re.compile(r"\d\d/[A-Z][a-z][a-z]/\d{4}:\d\d:\d\d:\d\d [+-]\d\d[0-5]\d", re.ASCII)
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NGINX_MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
 ASSET_PATTERN = re.compile(
     r"\.(css|js|mjs|ico|png|jpg|jpeg|gif|svg|webp|avif|woff|woff2|ttf|eot|map|txt|xml)$",
     re.IGNORECASE,
 )
+ASSET_EXTENSIONS = frozenset(
+    {
+        "css",
+        "js",
+        "mjs",
+        "ico",
+        "png",
+        "jpg",
+        "jpeg",
+        "gif",
+        "svg",
+        "webp",
+        "avif",
+        "woff",
+        "woff2",
+        "ttf",
+        "eot",
+        "map",
+        "txt",
+        "xml",
+    }
+)
 EXACT_ASSET_PATHS = {
     "/favicon.ico",
     "/robots.txt",
@@ -43,7 +96,19 @@ CONTENT_SECTION_NAMES = (
     "taxkit",
     "other",
 )
+SECTION_SUMMARY_KEYS = tuple(
+    (name, f"content_{name}_requests", f"organic_{name}_referrals", f"organic_non_bot_{name}_referrals")
+    for name in CONTENT_SECTION_NAMES
+)
 KIT_SECTION_NAMES = ("datekit", "budgetkit", "healthkit", "sleepkit", "focuskit", "opskit", "studykit", "careerkit", "housingkit", "taxkit")
+KIT_SECTION_NAME_SET = frozenset(KIT_SECTION_NAMES)
+CONTENT_SECTION_BY_SEGMENT = {
+    "": "homepage",
+    "blog": "blog",
+    "tools": "tools",
+    "cheatsheets": "cheatsheets",
+    **{name: name for name in KIT_SECTION_NAMES},
+}
 INTERNAL_CROSSPROPERTY_TARGETS = (
     "datekit",
     "budgetkit",
@@ -57,6 +122,7 @@ INTERNAL_CROSSPROPERTY_TARGETS = (
     "taxkit",
 )
 CROSSPROMO_CAMPAIGN_NAME = "crosspromo-top-organic"
+CROSSPROMO_CAMPAIGN_MARKER = f"utm_campaign={CROSSPROMO_CAMPAIGN_NAME}"
 CROSSPROMO_REDIRECT_TARGETS = {
     "datekit",
     "budgetkit",
@@ -69,7 +135,7 @@ CROSSPROMO_REDIRECT_TARGETS = {
     "housingkit",
     "kits",
 }
-INFERRED_SOURCE_LOOKBACK = timedelta(minutes=30)
+INFERRED_SOURCE_LOOKBACK_SECONDS = 30 * 60
 INFERRED_SOURCE_MAX_RECENT_PATHS = 200
 INFERRED_SOURCE_SECTION_PATHS = {
     "homepage": "/",
@@ -88,22 +154,36 @@ INFERRED_SOURCE_SECTION_PATHS = {
     "taxkit": "/taxkit",
 }
 BLOG_SLUG_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]*$")
-ENGINE_PATTERNS = [
-    (re.compile(r"google\.", re.IGNORECASE), "google"),
-    (re.compile(r"bing\.", re.IGNORECASE), "bing"),
-    (re.compile(r"duckduckgo\.", re.IGNORECASE), "duckduckgo"),
-    (re.compile(r"yahoo\.", re.IGNORECASE), "yahoo"),
-    (re.compile(r"ecosia\.", re.IGNORECASE), "ecosia"),
-    (re.compile(r"qwant\.", re.IGNORECASE), "qwant"),
-    (re.compile(r"aol\.", re.IGNORECASE), "aol"),
-    (re.compile(r"search\.brave\.com", re.IGNORECASE), "brave"),
-    (re.compile(r"yandex\.", re.IGNORECASE), "yandex"),
-]
-BOT_UA_PATTERNS = [
-    re.compile(r"(?:^|[^a-z])(bot|crawler|spider|slurp)(?:[^a-z]|$)", re.IGNORECASE),
-    re.compile(r"(?:^|[^a-z])(headless|lighthouse|pagespeed)(?:[^a-z]|$)", re.IGNORECASE),
-    re.compile(r"(?:^|[^a-z])(curl|wget|python-requests|scrapy|httpclient|go-http-client)(?:[^a-z]|$)", re.IGNORECASE),
-]
+MULTISLASH_PATTERN = re.compile(r"/{2,}")
+ENGINE_LITERALS = (
+    ("google.", "google"),
+    ("bing.", "bing"),
+    ("duckduckgo.", "duckduckgo"),
+    ("yahoo.", "yahoo"),
+    ("ecosia.", "ecosia"),
+    ("qwant.", "qwant"),
+    ("aol.", "aol"),
+    ("search.brave.com", "brave"),
+    ("yandex.", "yandex"),
+)
+ENGINE_PATTERNS = [(re.compile(re.escape(literal), re.IGNORECASE), name) for literal, name in ENGINE_LITERALS]
+ENGINE_PATTERN = re.compile("|".join(f"({pattern.pattern})" for pattern, _ in ENGINE_PATTERNS), re.IGNORECASE)
+BOT_UA_TOKENS = (
+    "bot",
+    "crawler",
+    "spider",
+    "slurp",
+    "headless",
+    "lighthouse",
+    "pagespeed",
+    "curl",
+    "wget",
+    "python-requests",
+    "scrapy",
+    "httpclient",
+    "go-http-client",
+)
+BOT_UA_PATTERN = re.compile(rf"(?:^|[^a-z])({'|'.join(map(re.escape, BOT_UA_TOKENS))})(?:[^a-z]|$)", re.IGNORECASE)
 SUSPECTED_CROSSPROMO_DATACENTER_IP_PREFIXES = (
     "43.130.",
     "43.131.",
@@ -123,9 +203,9 @@ SUSPECTED_CROSSPROMO_DATACENTER_IP_PREFIXES = (
     "124.156.",
     "170.106.",
 )
-SUSPECTED_CROSSPROMO_SPOOFED_MOBILE_UA = re.compile(
-    r"^Mozilla/5\.0 \(iPhone; CPU iPhone OS 13_2_3 like Mac OS X\) AppleWebKit/605\.1\.15 "
-    r"\(KHTML, like Gecko\) Version/13\.0\.3 Mobile/15E148 Safari/604\.1$"
+SUSPECTED_CROSSPROMO_SPOOFED_MOBILE_UA = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 13_2_3 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/13.0.3 Mobile/15E148 Safari/604.1"
 )
 SUSPICIOUS_PATH_PATTERNS = [
     re.compile(r"^/(?:wp-admin(?:/|$)|wp-login\.php$|xmlrpc\.php$)", re.IGNORECASE),
@@ -169,29 +249,543 @@ SUSPICIOUS_PATH_PATTERNS = [
     re.compile(r"^/(?:package\.json|package-lock\.json|composer\.lock|yarn\.lock|pnpm-lock\.yaml)$", re.IGNORECASE),
     re.compile(r"^/_next(?:/|$)", re.IGNORECASE),
 ]
+SUSPICIOUS_PATH_PREFIX_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern[1:]})" for pattern in SUSPICIOUS_PATH_PATTERNS if pattern.pattern.startswith("^")),
+    re.IGNORECASE,
+)
+SUSPICIOUS_PATH_ANYWHERE_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in SUSPICIOUS_PATH_PATTERNS if not pattern.pattern.startswith("^")),
+    re.IGNORECASE,
+)
+# Every unanchored pattern contains one of these (lowercase, case-fold safe), so paths
+# without any of them can skip the search.
+SUSPICIOUS_PATH_ANYWHERE_LITERALS = ("ph", "nfo", ".env", "%7c_", "|_", "/.g")
+SUMMARY_REPORT_COUNT_KEYS = (
+    "total_requests",
+    "unique_ips",
+    "clean_requests",
+    "clean_unique_ips",
+    "content_requests",
+    "content_unique_ips",
+    "suspicious_requests",
+    "not_found_requests",
+    "suspicious_404",
+    "organic_referrals",
+    "organic_non_bot_referrals",
+    "organic_kit_referrals",
+    "organic_non_bot_kit_referrals",
+    "crosspromo_campaign_hits",
+    *(f"crosspromo_campaign_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    *(f"crosspromo_non_bot_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    "crosspromo_source_attributed_hits",
+    "crosspromo_non_bot_source_attributed_hits",
+    "crosspromo_hits_with_param_source",
+    "crosspromo_non_bot_hits_with_param_source",
+    "crosspromo_hits_with_param_source_without_referrer",
+    "crosspromo_non_bot_hits_with_param_source_without_referrer",
+    "crosspromo_hits_with_internal_referrer",
+    "crosspromo_hits_with_inferred_source",
+    "crosspromo_inferred_verified_hits",
+    "crosspromo_inferred_unverified_hits",
+    "crosspromo_hits_unattributed",
+    "crosspromo_non_bot_hits_with_internal_referrer",
+    "crosspromo_non_bot_hits_with_inferred_source",
+    "crosspromo_non_bot_inferred_verified_hits",
+    "crosspromo_non_bot_inferred_unverified_hits",
+    "crosspromo_non_bot_hits_unattributed",
+    "crosspromo_hits_with_any_referrer",
+    "crosspromo_hits_without_referrer",
+    "crosspromo_non_bot_hits_with_any_referrer",
+    "crosspromo_non_bot_hits_without_referrer",
+    "crosspromo_hits_without_referrer_known_bot",
+    "crosspromo_hits_without_referrer_non_bot",
+    "crosspromo_known_bot_hits",
+    "crosspromo_non_bot_hits",
+    "crosspromo_non_bot_high_confidence_hits",
+    "crosspromo_non_bot_low_confidence_hits",
+    "crosspromo_suspected_automation_hits",
+    "crosspromo_suspected_automation_unique_ips",
+    "crosspromo_source_mismatch_hits",
+    "internal_crossproperty_referrals",
+    "internal_crossproperty_non_bot_referrals",
+    "internal_crossproperty_inferred_referrals",
+    "internal_crossproperty_inferred_non_bot_referrals",
+    "internal_crossproperty_inferred_verified_referrals",
+    "internal_crossproperty_inferred_non_bot_verified_referrals",
+    "internal_crossproperty_inferred_unverified_referrals",
+    "internal_crossproperty_inferred_non_bot_unverified_referrals",
+    "internal_crossproperty_effective_referrals",
+    "internal_crossproperty_effective_non_bot_referrals",
+    "internal_crossproperty_high_confidence_non_bot_referrals",
+    "internal_crossproperty_low_confidence_non_bot_referrals",
+    "known_bot_requests",
+    "known_bot_unique_ips",
+    "top_organic_non_bot_section",
+    "top_organic_non_bot_page",
+    "top_organic_non_bot_kit_section",
+    "top_organic_non_bot_kit_page",
+    "top_crosspromo_campaign_source",
+    "top_crosspromo_campaign_target_section",
+    "top_crosspromo_campaign_source_target_section",
+)
+SUMMARY_REPORT_RATIO_KEYS = (
+    "clean_request_ratio",
+    "suspicious_request_ratio",
+    "known_bot_request_ratio",
+    "organic_referral_ratio",
+    "organic_non_bot_referral_ratio",
+    "organic_non_bot_kit_referral_ratio",
+    "internal_crossproperty_referral_ratio",
+    "internal_crossproperty_non_bot_referral_ratio",
+    "internal_crossproperty_inferred_referral_ratio",
+    "internal_crossproperty_inferred_non_bot_referral_ratio",
+    "internal_crossproperty_effective_referral_ratio",
+    "internal_crossproperty_effective_non_bot_referral_ratio",
+    "internal_crossproperty_high_confidence_non_bot_referral_ratio",
+    "internal_crossproperty_low_confidence_non_bot_referral_ratio",
+    "internal_crossproperty_high_confidence_non_bot_of_effective_ratio",
+    "crosspromo_source_attribution_ratio",
+    "crosspromo_known_bot_ratio",
+    "crosspromo_suspected_automation_ratio",
+    "crosspromo_non_bot_source_attribution_ratio",
+    "crosspromo_non_bot_high_confidence_ratio",
+    "crosspromo_non_bot_low_confidence_ratio",
+    "crosspromo_without_referrer_ratio",
+    "crosspromo_non_bot_without_referrer_ratio",
+    "crosspromo_param_source_ratio",
+    "crosspromo_non_bot_param_source_ratio",
+    "crosspromo_param_source_without_referrer_ratio",
+    "crosspromo_non_bot_param_source_without_referrer_ratio",
+    "crosspromo_inferred_verification_ratio",
+    "crosspromo_non_bot_inferred_verification_ratio",
+    "internal_crossproperty_inferred_verified_referral_ratio",
+    "internal_crossproperty_inferred_non_bot_verified_referral_ratio",
+    "internal_crossproperty_inferred_unverified_referral_ratio",
+    "internal_crossproperty_inferred_non_bot_unverified_referral_ratio",
+)
+SUMMARY_REPORT_TEMPLATE = (
+    "=== TRAFFIC SUMMARY (last {window_hours}h) ===\n"
+    + "".join(f"  {key}: {{{key}}}\n" for key in SUMMARY_REPORT_COUNT_KEYS)
+    + "".join(f"  {key}: {{{key}}}%\n" for key in SUMMARY_REPORT_RATIO_KEYS)
+)
+REPORT_ROW_COUNT_FIRST = "  {1:4d}  {0}".format
+REPORT_ROW_KEY_FIRST = "  {0}: {1}".format
+REPORT_RANKED_SECTIONS = (
+    ("STATUS CODES", "status_codes", REPORT_ROW_KEY_FIRST),
+    ("TOP PAGES (non-asset)", "top_pages", REPORT_ROW_COUNT_FIRST),
+    ("ORGANIC ENGINES", "organic_engines", REPORT_ROW_KEY_FIRST),
+    ("ORGANIC NON-BOT ENGINES", "organic_non_bot_engines", REPORT_ROW_KEY_FIRST),
+    ("TOP ORGANIC LANDING PAGES", "top_organic_pages", REPORT_ROW_COUNT_FIRST),
+    ("TOP ORGANIC NON-BOT LANDING PAGES", "top_organic_non_bot_pages", REPORT_ROW_COUNT_FIRST),
+    ("TOP ORGANIC NON-BOT KIT LANDING PAGES", "top_organic_non_bot_kit_pages", REPORT_ROW_COUNT_FIRST),
+    ("TOP EXTERNAL REFERRERS", "top_external_referrers", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN LANDINGS", "crosspromo_campaign_pages", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN SOURCES", "crosspromo_campaign_sources", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN SOURCE PAGES", "crosspromo_campaign_source_pages", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN PARAM-SOURCE PAGES (from utm_content)", "crosspromo_campaign_param_source_pages", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN SOURCE SECTIONS", "crosspromo_campaign_source_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO CAMPAIGN PARAM-SOURCE SECTIONS (from utm_content)", "crosspromo_campaign_param_source_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO CAMPAIGN TARGET SECTIONS", "crosspromo_campaign_target_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO CAMPAIGN SOURCE->TARGET SECTION PAIRS", "crosspromo_campaign_source_target_sections", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO CAMPAIGN SOURCE->TARGET PAGE PAIRS", "crosspromo_campaign_page_path_pairs", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN SOURCES", "crosspromo_non_bot_campaign_sources", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN SOURCE PAGES", "crosspromo_non_bot_campaign_source_pages", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN PARAM-SOURCE PAGES (from utm_content)", "crosspromo_non_bot_campaign_param_source_pages", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN SOURCE SECTIONS", "crosspromo_non_bot_campaign_source_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN PARAM-SOURCE SECTIONS (from utm_content)", "crosspromo_non_bot_campaign_param_source_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN TARGET SECTIONS", "crosspromo_non_bot_campaign_target_sections", REPORT_ROW_KEY_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN SOURCE->TARGET SECTION PAIRS", "crosspromo_non_bot_campaign_source_target_sections", REPORT_ROW_COUNT_FIRST),
+    ("CROSSPROMO NON-BOT CAMPAIGN SOURCE->TARGET PAGE PAIRS", "crosspromo_non_bot_campaign_page_path_pairs", REPORT_ROW_COUNT_FIRST),
+    ("TOP CROSSPROMO KNOWN BOT USER AGENTS", "crosspromo_known_bot_user_agents", REPORT_ROW_COUNT_FIRST),
+    ("TOP CROSSPROMO SUSPECTED AUTOMATION USER AGENTS", "crosspromo_suspected_automation_user_agents", REPORT_ROW_COUNT_FIRST),
+)
+REPORT_RANKED_COUNTERS = (
+    ("status_codes", "status_counts", "code"),
+    ("content_sections", "content_section_counts", "section"),
+    ("organic_sections", "organic_section_counts", "section"),
+    ("organic_non_bot_sections", "organic_non_bot_section_counts", "section"),
+    ("top_pages", "page_counts", "path"),
+    ("organic_engines", "organic_engine_counts", "engine"),
+    ("organic_non_bot_engines", "organic_non_bot_engine_counts", "engine"),
+    ("top_organic_pages", "organic_page_counts", "path"),
+    ("top_organic_non_bot_pages", "organic_non_bot_page_counts", "path"),
+    ("top_organic_non_bot_kit_pages", "organic_non_bot_kit_page_counts", "path"),
+    ("top_external_referrers", "external_referrers", "referrer"),
+    ("crosspromo_campaign_pages", "crosspromo_campaign_pages", "path"),
+    ("crosspromo_campaign_sources", "crosspromo_campaign_sources", "source"),
+    ("crosspromo_campaign_source_pages", "crosspromo_campaign_source_pages", "path"),
+    ("crosspromo_campaign_param_source_pages", "crosspromo_campaign_param_source_pages", "path"),
+    ("crosspromo_campaign_source_sections", "crosspromo_campaign_source_sections", "section"),
+    ("crosspromo_campaign_param_source_sections", "crosspromo_campaign_param_source_sections", "section"),
+    ("crosspromo_campaign_target_sections", "crosspromo_campaign_target_sections", "section"),
+    ("crosspromo_campaign_source_target_sections", "crosspromo_campaign_source_target_sections", "pair"),
+    ("crosspromo_campaign_page_path_pairs", "crosspromo_campaign_page_path_pairs", "pair"),
+    ("crosspromo_non_bot_campaign_sources", "crosspromo_non_bot_campaign_sources", "source"),
+    ("crosspromo_non_bot_campaign_source_pages", "crosspromo_non_bot_campaign_source_pages", "path"),
+    ("crosspromo_non_bot_campaign_param_source_pages", "crosspromo_non_bot_campaign_param_source_pages", "path"),
+    ("crosspromo_non_bot_campaign_source_sections", "crosspromo_non_bot_campaign_source_sections", "section"),
+    ("crosspromo_non_bot_campaign_param_source_sections", "crosspromo_non_bot_campaign_param_source_sections", "section"),
+    ("crosspromo_non_bot_campaign_target_sections", "crosspromo_non_bot_campaign_target_sections", "section"),
+    ("crosspromo_non_bot_campaign_source_target_sections", "crosspromo_non_bot_campaign_source_target_sections", "pair"),
+    ("crosspromo_non_bot_campaign_page_path_pairs", "crosspromo_non_bot_campaign_page_path_pairs", "pair"),
+    ("crosspromo_known_bot_user_agents", "crosspromo_known_bot_user_agents", "user_agent"),
+    ("crosspromo_suspected_automation_user_agents", "crosspromo_suspected_automation_user_agents", "user_agent"),
+    ("internal_crossproperty_target_sections", "internal_crossproperty_target_sections", "section"),
+    ("internal_crossproperty_source_sections", "internal_crossproperty_source_sections", "section"),
+    ("internal_crossproperty_source_pages", "internal_crossproperty_source_pages", "path"),
+    ("internal_crossproperty_target_pages", "internal_crossproperty_target_pages", "path"),
+    ("internal_crossproperty_non_bot_target_sections", "internal_crossproperty_non_bot_target_sections", "section"),
+    ("internal_crossproperty_non_bot_source_sections", "internal_crossproperty_non_bot_source_sections", "section"),
+    ("internal_crossproperty_non_bot_source_pages", "internal_crossproperty_non_bot_source_pages", "path"),
+    ("internal_crossproperty_non_bot_target_pages", "internal_crossproperty_non_bot_target_pages", "path"),
+    ("internal_crossproperty_inferred_target_sections", "internal_crossproperty_inferred_target_sections", "section"),
+    (
+        "internal_crossproperty_inferred_non_bot_target_sections",
+        "internal_crossproperty_inferred_non_bot_target_sections",
+        "section",
+    ),
+    (
+        "internal_crossproperty_inferred_verified_target_sections",
+        "internal_crossproperty_inferred_verified_target_sections",
+        "section",
+    ),
+    (
+        "internal_crossproperty_inferred_non_bot_verified_target_sections",
+        "internal_crossproperty_inferred_non_bot_verified_target_sections",
+        "section",
+    ),
+    (
+        "internal_crossproperty_inferred_unverified_target_sections",
+        "internal_crossproperty_inferred_unverified_target_sections",
+        "section",
+    ),
+    (
+        "internal_crossproperty_inferred_non_bot_unverified_target_sections",
+        "internal_crossproperty_inferred_non_bot_unverified_target_sections",
+        "section",
+    ),
+    ("top_404_pages", "not_found_pages", "path"),
+    ("top_clean_404_pages", "clean_not_found_pages", "path"),
+    ("top_suspicious_paths", "suspicious_paths", "path"),
+)
+REPORT_NOT_FOUND_SECTIONS = (
+    ("TOP 404 PAGES", "top_404_pages", REPORT_ROW_COUNT_FIRST),
+    ("TOP CLEAN 404 PAGES", "top_clean_404_pages", REPORT_ROW_COUNT_FIRST),
+)
+COMPARISON_METRICS = (
+    "total_requests",
+    "unique_ips",
+    "clean_requests",
+    "content_requests",
+    "suspicious_requests",
+    "not_found_requests",
+    "clean_404",
+    "suspicious_404",
+    "organic_referrals",
+    "organic_non_bot_referrals",
+    "organic_kit_referrals",
+    "organic_non_bot_kit_referrals",
+    "crosspromo_campaign_hits",
+    *(f"crosspromo_campaign_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    *(f"crosspromo_non_bot_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    "crosspromo_source_attributed_hits",
+    "crosspromo_non_bot_source_attributed_hits",
+    "crosspromo_hits_with_param_source",
+    "crosspromo_non_bot_hits_with_param_source",
+    "crosspromo_hits_with_param_source_without_referrer",
+    "crosspromo_non_bot_hits_with_param_source_without_referrer",
+    "crosspromo_hits_with_internal_referrer",
+    "crosspromo_hits_with_inferred_source",
+    "crosspromo_inferred_verified_hits",
+    "crosspromo_inferred_unverified_hits",
+    "crosspromo_hits_unattributed",
+    "crosspromo_non_bot_hits_with_internal_referrer",
+    "crosspromo_non_bot_hits_with_inferred_source",
+    "crosspromo_non_bot_inferred_verified_hits",
+    "crosspromo_non_bot_inferred_unverified_hits",
+    "crosspromo_non_bot_hits_unattributed",
+    "crosspromo_hits_with_any_referrer",
+    "crosspromo_hits_without_referrer",
+    "crosspromo_non_bot_hits_with_any_referrer",
+    "crosspromo_non_bot_hits_without_referrer",
+    "crosspromo_hits_without_referrer_known_bot",
+    "crosspromo_hits_without_referrer_non_bot",
+    "crosspromo_known_bot_hits",
+    "crosspromo_non_bot_hits",
+    "crosspromo_non_bot_high_confidence_hits",
+    "crosspromo_non_bot_low_confidence_hits",
+    "crosspromo_source_mismatch_hits",
+    "internal_crossproperty_referrals",
+    *(f"internal_crossproperty_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_non_bot_referrals",
+    *(f"internal_crossproperty_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_referrals",
+    *(f"internal_crossproperty_inferred_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_non_bot_referrals",
+    *(f"internal_crossproperty_inferred_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_verified_referrals",
+    "internal_crossproperty_inferred_non_bot_verified_referrals",
+    "internal_crossproperty_inferred_unverified_referrals",
+    "internal_crossproperty_inferred_non_bot_unverified_referrals",
+    "internal_crossproperty_effective_referrals",
+    *(f"internal_crossproperty_effective_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_effective_non_bot_referrals",
+    *(f"internal_crossproperty_effective_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_high_confidence_non_bot_referrals",
+    *(f"internal_crossproperty_high_confidence_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_low_confidence_non_bot_referrals",
+    "known_bot_requests",
+    "known_bot_unique_ips",
+    "content_homepage_requests",
+    "content_blog_requests",
+    "content_tools_requests",
+    "content_cheatsheets_requests",
+    *(f"content_{name}_requests" for name in KIT_SECTION_NAMES),
+    "content_other_requests",
+    "organic_homepage_referrals",
+    "organic_blog_referrals",
+    "organic_tools_referrals",
+    "organic_cheatsheets_referrals",
+    *(f"organic_{name}_referrals" for name in KIT_SECTION_NAMES),
+    "organic_other_referrals",
+    "organic_non_bot_homepage_referrals",
+    "organic_non_bot_blog_referrals",
+    "organic_non_bot_tools_referrals",
+    "organic_non_bot_cheatsheets_referrals",
+    *(f"organic_non_bot_{name}_referrals" for name in KIT_SECTION_NAMES),
+    "organic_non_bot_other_referrals",
+)
+COMPARISON_REPORT_METRICS = (
+    "total_requests",
+    "unique_ips",
+    "content_requests",
+    "content_blog_requests",
+    "content_tools_requests",
+    "content_cheatsheets_requests",
+    *(f"content_{name}_requests" for name in KIT_SECTION_NAMES),
+    "suspicious_requests",
+    "not_found_requests",
+    "organic_referrals",
+    "organic_non_bot_referrals",
+    "organic_kit_referrals",
+    "organic_non_bot_kit_referrals",
+    "organic_blog_referrals",
+    "organic_tools_referrals",
+    "organic_cheatsheets_referrals",
+    *(f"organic_{name}_referrals" for name in KIT_SECTION_NAMES),
+    "organic_non_bot_blog_referrals",
+    "organic_non_bot_tools_referrals",
+    "organic_non_bot_cheatsheets_referrals",
+    *(f"organic_non_bot_{name}_referrals" for name in KIT_SECTION_NAMES),
+    "crosspromo_campaign_hits",
+    *(f"crosspromo_campaign_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    *(f"crosspromo_non_bot_hits_to_{name}" for name in KIT_SECTION_NAMES),
+    "crosspromo_source_attributed_hits",
+    "crosspromo_non_bot_source_attributed_hits",
+    "crosspromo_hits_with_param_source",
+    "crosspromo_non_bot_hits_with_param_source",
+    "crosspromo_hits_with_param_source_without_referrer",
+    "crosspromo_non_bot_hits_with_param_source_without_referrer",
+    "crosspromo_hits_with_internal_referrer",
+    "crosspromo_hits_with_inferred_source",
+    "crosspromo_inferred_verified_hits",
+    "crosspromo_inferred_unverified_hits",
+    "crosspromo_hits_unattributed",
+    "crosspromo_non_bot_hits_with_internal_referrer",
+    "crosspromo_non_bot_hits_with_inferred_source",
+    "crosspromo_non_bot_inferred_verified_hits",
+    "crosspromo_non_bot_inferred_unverified_hits",
+    "crosspromo_non_bot_hits_unattributed",
+    "crosspromo_hits_with_any_referrer",
+    "crosspromo_hits_without_referrer",
+    "crosspromo_non_bot_hits_with_any_referrer",
+    "crosspromo_non_bot_hits_without_referrer",
+    "crosspromo_hits_without_referrer_known_bot",
+    "crosspromo_hits_without_referrer_non_bot",
+    "crosspromo_known_bot_hits",
+    "crosspromo_non_bot_hits",
+    "crosspromo_non_bot_high_confidence_hits",
+    "crosspromo_non_bot_low_confidence_hits",
+    "crosspromo_source_mismatch_hits",
+    "internal_crossproperty_referrals",
+    *(f"internal_crossproperty_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_non_bot_referrals",
+    *(f"internal_crossproperty_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_referrals",
+    *(f"internal_crossproperty_inferred_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_non_bot_referrals",
+    *(f"internal_crossproperty_inferred_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_inferred_verified_referrals",
+    "internal_crossproperty_inferred_non_bot_verified_referrals",
+    "internal_crossproperty_inferred_unverified_referrals",
+    "internal_crossproperty_inferred_non_bot_unverified_referrals",
+    "internal_crossproperty_effective_referrals",
+    *(f"internal_crossproperty_effective_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_effective_non_bot_referrals",
+    *(f"internal_crossproperty_effective_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_high_confidence_non_bot_referrals",
+    *(f"internal_crossproperty_high_confidence_non_bot_referrals_to_{name}" for name in KIT_SECTION_NAMES),
+    "internal_crossproperty_low_confidence_non_bot_referrals",
+    "known_bot_requests",
+    "known_bot_unique_ips",
+)
+COMPARISON_REPORT_PCT_KEYS = tuple(f"{metric}_pct" for metric in COMPARISON_REPORT_METRICS)
 
 
-def read_log_lines(path: str):
+def read_log_lines(path: str) -> Iterator[str]:
     if not os.path.exists(path):
-        return []
+        return iter(())
     try:
-        with open(path, encoding="utf-8", errors="replace") as f:
-            return f.readlines()
+        f = open(path, encoding="utf-8", errors="replace")
     except PermissionError:
-        output = subprocess.check_output(["sudo", "-n", "cat", path], text=True, stderr=subprocess.DEVNULL)
-        return output.splitlines(keepends=True)
+        return read_privileged_log_lines(path)
+    if hasattr(os, "posix_fadvise"):
+        with contextlib.suppress(OSError):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return read_open_log_lines(f)
+
+
+def read_open_log_lines(f) -> Iterator[str]:
+    with f:
+        yield from f
+
+
+def read_privileged_log_lines(path: str) -> Iterator[str]:
+    with subprocess.Popen(["sudo", "-n", "cat", path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as proc:
+        for line in proc.stdout:
+            # splitlines() also breaks on \v, \f, \x85 and friends, as it did on the whole output.
+            yield from line.splitlines(keepends=True)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+
+def epoch_seconds(moment: datetime) -> int:
+    # Rounded up, so whole-second timestamps compare against it exactly as against the datetime.
+    return -((UNIX_EPOCH - moment) // timedelta(seconds=1))
+
+
+@lru_cache(maxsize=4096)
+def nginx_day_start(day_text: str) -> int:
+    # "dd/Mon/yyyy" -> epoch seconds at 00:00 UTC; raises ValueError for impossible dates.
+    return int(datetime(int(day_text[7:11]), NGINX_MONTHS[day_text[3:6]], int(day_text[:2]), tzinfo=timezone.utc).timestamp())
+
+
+@lru_cache(maxsize=256)
+def nginx_offset_seconds(offset_text: str) -> int:
+    seconds = int(offset_text[1:3]) * 3600 + int(offset_text[3:5]) * 60
+    return -seconds if offset_text[0] == "-" else seconds
+
+
+def parse_nginx_timestamp(raw_ts: str) -> int:
+    if raw_ts[22:24] < "24" and raw_ts[3:6] in NGINX_MONTHS and NGINX_TIMESTAMP_PATTERN.fullmatch(raw_ts):
+        hour = int(raw_ts[12:14])
+        minute = int(raw_ts[15:17])
+        second = int(raw_ts[18:20])
+        if hour < 24 and minute < 60 and second < 60:
+            return nginx_day_start(raw_ts[:11]) + hour * 3600 + minute * 60 + second - nginx_offset_seconds(raw_ts[21:])
+    # Non-canonical or out-of-range text: strptime accepts or rejects it exactly as before.
+    return int(datetime.strptime(raw_ts, "%d/%b/%Y:%H:%M:%S %z").timestamp())
+
+
+def parse_log_events(lines: Iterable[str], earliest_start: datetime):
+    events: list[tuple[int, str, str, str, str, str, str]] = []
+    earliest_start_epoch = epoch_seconds(earliest_start)
+    match_log_line = LOG_PATTERN.match
+    intern = sys.intern
+    earliest_start_text = earliest_start.strftime("%d/%b/%Y:%H:%M:%S")
+    earliest_start_month = earliest_start_text[2:12]
+    earliest_start_year = earliest_start_text[7:11]
+    earliest_start_month_number = earliest_start.month
+
+    for match in map(match_log_line, lines):
+        if not match:
+            continue
+
+        ip, raw_ts, request, status, referrer, user_agent = match.groups()
+        # Within one month and a +0000 offset, nginx timestamps sort lexicographically;
+        # older months and years are screened on the year text and month table.
+        if raw_ts[20:] == " +0000" and raw_ts[0].isdigit():
+            if raw_ts[2:12] == earliest_start_month:
+                if raw_ts[19].isdigit() and raw_ts[:20] < earliest_start_text:
+                    continue
+            elif (
+                raw_ts[2] == "/"
+                and raw_ts[6] == "/"
+                and raw_ts[11] == ":"
+                and (
+                    raw_ts[7:11] < earliest_start_year
+                    or (
+                        raw_ts[7:11] == earliest_start_year
+                        and NGINX_MONTHS.get(raw_ts[3:6], 13) < earliest_start_month_number
+                    )
+                )
+            ):
+                continue
+        try:
+            ts = parse_nginx_timestamp(raw_ts)
+        except ValueError:
+            continue
+        if ts < earliest_start_epoch:
+            continue
+
+        ip = intern(ip)
+        status = intern(status)
+        referrer = intern(referrer.strip())
+        user_agent = intern(user_agent.strip())
+        path, query = parse_request_path_query(request)
+        events.append((ts, ip, status, referrer, path, query, user_agent))
+    return events
+
+
+def parse_log_events_in_pool(pool, lines: Iterable[str], earliest_start: datetime, max_pending: int):
+    events = []
+    pending = deque()
+    lines = iter(lines)
+    while batch := list(islice(lines, PARALLEL_PARSE_BATCH_LINES)):
+        pending.append(pool.apply_async(parse_log_events, (batch, earliest_start)))
+        if len(pending) > max_pending:
+            events.extend(pending.popleft().get())
+    # Results are collected in submission order, so the event order matches a serial run.
+    for result in pending:
+        events.extend(result.get())
+    return events
 
 
 def parse_request_path_query(request: str):
-    parts = request.split()
-    if len(parts) < 2:
-        return "", ""
-    target = parts[1].strip()
+    # isprintable() rules out every whitespace character except the plain space.
+    method_end = request.find(" ") if request.isprintable() else -1
+    target_end = request.find(" ", method_end + 1)
+    if target_end == -1:
+        target_end = len(request)
+    if method_end > 0 and target_end > method_end + 1:
+        target = request[method_end + 1 : target_end]
+    else:
+        # Leading or doubled spaces, or other whitespace: let split() handle it.
+        parts = request.split()
+        if len(parts) < 2:
+            return "", ""
+        target = parts[1].strip()
     path, _, query = target.partition("?")
     normalized = normalize_path(path or "/")
     return (normalized or "/"), query
 
 
+def parse_utm_content_values(query: str) -> list[str]:
+    # Same fields parse_qs(query)["utm_content"] yields: blank values are dropped, names may be escaped.
+    if "utm_content=" not in query and "%" not in query:
+        return []
+    values = []
+    for field in query.split("&"):
+        name, _, value = field.partition("=")
+        if not value:
+            continue
+        if name != "utm_content" and ("%" not in name or unquote_plus(name) != "utm_content"):
+            continue
+        values.append(unquote_plus(value))
+    return values
+
+
+@lru_cache(maxsize=65536)
 def normalize_path(path: str) -> str:
     if not path:
         return ""
@@ -206,60 +800,64 @@ def normalize_path(path: str) -> str:
         raw_path = parsed.path or "/"
     if not raw_path.startswith("/"):
         raw_path = f"/{raw_path}"
-    normalized = re.sub(r"/{2,}", "/", raw_path)
+    normalized = MULTISLASH_PATTERN.sub("/", raw_path) if "//" in raw_path else raw_path
     if len(normalized) > 1:
         normalized = normalized.rstrip("/")
     return normalized or "/"
 
 
+@lru_cache(maxsize=65536)
 def is_asset_path(path: str) -> bool:
     if not path:
         return True
     if path in EXACT_ASSET_PATHS:
         return True
-    if path.startswith("/assets/") or path.startswith("/static/"):
+    if path.startswith(("/assets/", "/static/")):
         return True
+    dot = path.rfind(".")
+    if dot == -1:
+        return False
+    extension = path[dot + 1 :]
+    if extension.isascii() and extension.isalnum():
+        return extension.lower() in ASSET_EXTENSIONS
+    # Unicode case folding and "$" before a trailing newline stay with the regex.
     return bool(ASSET_PATTERN.search(path))
 
 
-def classify_content_section(path: str) -> str:
-    path = normalize_path(path) or "/"
-    if path == "/":
-        return "homepage"
-    if path == "/blog" or path.startswith("/blog/"):
-        return "blog"
-    if path == "/tools" or path.startswith("/tools/"):
-        return "tools"
-    if path == "/cheatsheets" or path.startswith("/cheatsheets/"):
-        return "cheatsheets"
-    if path == "/datekit" or path.startswith("/datekit/"):
-        return "datekit"
-    if path == "/budgetkit" or path.startswith("/budgetkit/"):
-        return "budgetkit"
-    if path == "/healthkit" or path.startswith("/healthkit/"):
-        return "healthkit"
-    if path == "/sleepkit" or path.startswith("/sleepkit/"):
-        return "sleepkit"
-    if path == "/focuskit" or path.startswith("/focuskit/"):
-        return "focuskit"
-    if path == "/opskit" or path.startswith("/opskit/"):
-        return "opskit"
-    if path == "/studykit" or path.startswith("/studykit/"):
-        return "studykit"
-    if path == "/careerkit" or path.startswith("/careerkit/"):
-        return "careerkit"
-    if path == "/housingkit" or path.startswith("/housingkit/"):
-        return "housingkit"
-    if path == "/taxkit" or path.startswith("/taxkit/"):
-        return "taxkit"
-    return "other"
+@lru_cache(maxsize=65536)
+def classify_normalized_section(path: str) -> str:
+    # normalize_path can leave whitespace where it stripped a trailing slash, as in "/blog\t/".
+    return CONTENT_SECTION_BY_SEGMENT.get(path.rstrip()[1:].partition("/")[0], "other")
 
 
+@lru_cache(maxsize=65536)
+def classify_path(path: str) -> tuple[bool, bool, str]:
+    asset = is_asset_path(path)
+    section = classify_normalized_section(path) if path and not asset else ""
+    return asset, is_suspicious_path(path), section
+
+
+@lru_cache(maxsize=65536)
+def classify_referrer(referrer: str) -> tuple[str, str, str]:
+    internal_path = parse_internal_referrer_path(referrer)
+    section = classify_normalized_section(internal_path) if internal_path else ""
+    return internal_path, section, detect_engine(referrer)
+
+
+@lru_cache(maxsize=65536)
 def detect_engine(referrer: str) -> str:
-    for pattern, name in ENGINE_PATTERNS:
-        if pattern.search(referrer):
-            return name
-    return ""
+    # Earlier engines win regardless of where in the referrer they match.
+    if referrer.isascii():
+        lowered = referrer.lower()
+        for literal, name in ENGINE_LITERALS:
+            if literal in lowered:
+                return name
+        return ""
+    # IGNORECASE also folds non-ASCII letters such as "ſ" and "İ" onto these, so leave those to the regex.
+    matched_groups = [match.lastindex for match in ENGINE_PATTERN.finditer(referrer)]
+    if not matched_groups:
+        return ""
+    return ENGINE_PATTERNS[min(matched_groups) - 1][1]
 
 
 def normalize_user_agent(user_agent: str) -> str:
@@ -269,24 +867,26 @@ def normalize_user_agent(user_agent: str) -> str:
     return value
 
 
+@lru_cache(maxsize=65536)
 def is_known_bot_user_agent(user_agent: str) -> bool:
     normalized = normalize_user_agent(user_agent)
     if not normalized:
         return False
-    for pattern in BOT_UA_PATTERNS:
-        if pattern.search(normalized):
-            return True
-    return False
+    if normalized.isascii():
+        lowered = normalized.lower()
+        if not any(token in lowered for token in BOT_UA_TOKENS):
+            return False
+    return bool(BOT_UA_PATTERN.search(normalized))
 
 
 def is_suspected_crosspromo_automation(ip: str, normalized_user_agent: str, referrer: str, query: str) -> bool:
-    if f"utm_campaign={CROSSPROMO_CAMPAIGN_NAME}" not in query:
+    if CROSSPROMO_CAMPAIGN_MARKER not in query:
         return False
     if referrer and referrer != "-":
         return False
     if not normalized_user_agent:
         return False
-    if not SUSPECTED_CROSSPROMO_SPOOFED_MOBILE_UA.fullmatch(normalized_user_agent):
+    if normalized_user_agent != SUSPECTED_CROSSPROMO_SPOOFED_MOBILE_UA:
         return False
     return ip.startswith(SUSPECTED_CROSSPROMO_DATACENTER_IP_PREFIXES)
 
@@ -299,6 +899,7 @@ def is_crosspromo_redirect_hop(path: str) -> bool:
     return target in CROSSPROMO_REDIRECT_TARGETS
 
 
+@lru_cache(maxsize=65536)
 def parse_internal_referrer_path(referrer: str) -> str:
     if not referrer or referrer == "-":
         return ""
@@ -340,23 +941,46 @@ def infer_internal_source_path(source: str) -> str:
     return ""
 
 
+@lru_cache(maxsize=65536)
 def is_suspicious_path(path: str) -> bool:
     if not path:
         return False
-    for pattern in SUSPICIOUS_PATH_PATTERNS:
-        if pattern.search(path):
-            return True
+    if SUSPICIOUS_PATH_PREFIX_PATTERN.match(path):
+        return True
+    lowered = path.lower()
+    for literal in SUSPICIOUS_PATH_ANYWHERE_LITERALS:
+        if literal in lowered:
+            return bool(SUSPICIOUS_PATH_ANYWHERE_PATTERN.search(path))
     return False
 
 
-def counter_to_sorted_list(counter: Counter, key_name: str, max_items: int | None = None):
-    if max_items is None or max_items < 0:
-        items = counter.most_common()
-    else:
-        items = counter.most_common(max_items)
+def most_common(counts: dict, max_items: int | None = None):
+    # Same ordering as Counter.most_common: ties keep first-seen order.
+    if max_items is None:
+        return sorted(counts.items(), key=itemgetter(1), reverse=True)
+    return heapq.nlargest(max_items, counts.items(), key=itemgetter(1))
+
+
+def join_pair_counts(pair_counts: dict) -> dict:
+    # Pairs are counted as tuples; distinct pairs can still spell the same "a->b" key and merge here.
+    joined = defaultdict(int)
+    for (source, target), count in pair_counts.items():
+        joined[f"{source}->{target}"] += count
+    return joined
+
+
+def ranked_to_list(items: list, key_name: str):
     return [{key_name: key, "count": count} for key, count in items]
 
 
+def kit_section_counts(section_counts: dict) -> tuple[int, ...]:
+    return tuple(section_counts.get(name, 0) for name in KIT_SECTION_NAMES)
+
+
+def kit_fields(prefix: str, counts: tuple[int, ...]) -> dict[str, int]:
+    return {f"{prefix}_{name}": count for name, count in zip(KIT_SECTION_NAMES, counts)}
+
+
 def safe_ratio(part: int, whole: int) -> float:
     if whole <= 0:
         return 0.0
@@ -375,41 +999,47 @@ class WindowStats:
         self.clean_requests = 0
         self.content_requests = 0
         self.suspicious_requests = 0
+        self.not_found_requests = 0
+        self.clean_not_found_requests = 0
+        self.suspicious_not_found_requests = 0
+        self.organic_referrals = 0
+        self.organic_non_bot_referrals = 0
         self.unique_ips = set()
         self.clean_unique_ips = set()
         self.content_unique_ips = set()
         self.suspicious_unique_ips = set()
-        self.status_counts = Counter()
-        self.page_counts = Counter()
-        self.content_section_counts = Counter()
-        self.organic_engine_counts = Counter()
-        self.organic_page_counts = Counter()
-        self.organic_section_counts = Counter()
-        self.organic_non_bot_engine_counts = Counter()
-        self.organic_non_bot_page_counts = Counter()
-        self.organic_non_bot_section_counts = Counter()
-        self.external_referrers = Counter()
-        self.not_found_pages = Counter()
-        self.clean_not_found_pages = Counter()
-        self.suspicious_paths = Counter()
-        self.suspicious_not_found_pages = Counter()
+        self.status_counts = defaultdict(int)
+        self.page_counts = defaultdict(int)
+        self.content_section_counts = defaultdict(int)
+        self.organic_engine_counts = defaultdict(int)
+        self.organic_page_counts = defaultdict(int)
+        self.organic_section_counts = defaultdict(int)
+        self.organic_non_bot_engine_counts = defaultdict(int)
+        self.organic_non_bot_page_counts = defaultdict(int)
+        self.organic_non_bot_kit_page_counts = defaultdict(int)
+        self.organic_non_bot_section_counts = defaultdict(int)
+        self.external_referrers = defaultdict(int)
+        self.not_found_pages = defaultdict(int)
+        self.clean_not_found_pages = defaultdict(int)
+        self.suspicious_paths = defaultdict(int)
+        self.suspicious_not_found_pages = defaultdict(int)
         self.crosspromo_campaign_hits = 0
-        self.crosspromo_campaign_pages = Counter()
-        self.crosspromo_campaign_sources = Counter()
-        self.crosspromo_campaign_source_pages = Counter()
-        self.crosspromo_campaign_source_sections = Counter()
-        self.crosspromo_campaign_target_sections = Counter()
-        self.crosspromo_campaign_source_target_sections = Counter()
-        self.crosspromo_campaign_page_path_pairs = Counter()
+        self.crosspromo_campaign_pages = defaultdict(int)
+        self.crosspromo_campaign_sources = defaultdict(int)
+        self.crosspromo_campaign_source_pages = defaultdict(int)
+        self.crosspromo_campaign_source_sections = defaultdict(int)
+        self.crosspromo_campaign_target_sections = defaultdict(int)
+        self.crosspromo_campaign_source_target_sections = defaultdict(int)
+        self.crosspromo_campaign_page_path_pairs = defaultdict(int)
         self.crosspromo_hits_with_internal_referrer = 0
         self.crosspromo_hits_with_inferred_source = 0
         self.crosspromo_hits_unattributed = 0
-        self.crosspromo_non_bot_campaign_sources = Counter()
-        self.crosspromo_non_bot_campaign_source_pages = Counter()
-        self.crosspromo_non_bot_campaign_source_sections = Counter()
-        self.crosspromo_non_bot_campaign_target_sections = Counter()
-        self.crosspromo_non_bot_campaign_source_target_sections = Counter()
-        self.crosspromo_non_bot_campaign_page_path_pairs = Counter()
+        self.crosspromo_non_bot_campaign_sources = defaultdict(int)
+        self.crosspromo_non_bot_campaign_source_pages = defaultdict(int)
+        self.crosspromo_non_bot_campaign_source_sections = defaultdict(int)
+        self.crosspromo_non_bot_campaign_target_sections = defaultdict(int)
+        self.crosspromo_non_bot_campaign_source_target_sections = defaultdict(int)
+        self.crosspromo_non_bot_campaign_page_path_pairs = defaultdict(int)
         self.crosspromo_non_bot_hits_with_internal_referrer = 0
         self.crosspromo_non_bot_hits_with_inferred_source = 0
         self.crosspromo_non_bot_hits_unattributed = 0
@@ -421,37 +1051,37 @@ class WindowStats:
         self.crosspromo_non_bot_hits_with_param_source = 0
         self.crosspromo_hits_with_param_source_without_referrer = 0
         self.crosspromo_non_bot_hits_with_param_source_without_referrer = 0
-        self.crosspromo_campaign_param_source_pages = Counter()
-        self.crosspromo_campaign_param_source_sections = Counter()
-        self.crosspromo_non_bot_campaign_param_source_pages = Counter()
-        self.crosspromo_non_bot_campaign_param_source_sections = Counter()
+        self.crosspromo_campaign_param_source_pages = defaultdict(int)
+        self.crosspromo_campaign_param_source_sections = defaultdict(int)
+        self.crosspromo_non_bot_campaign_param_source_pages = defaultdict(int)
+        self.crosspromo_non_bot_campaign_param_source_sections = defaultdict(int)
         self.crosspromo_source_mismatch_hits = 0
         self.internal_crossproperty_referrals = 0
-        self.internal_crossproperty_target_sections = Counter()
-        self.internal_crossproperty_source_sections = Counter()
-        self.internal_crossproperty_target_pages = Counter()
-        self.internal_crossproperty_source_pages = Counter()
+        self.internal_crossproperty_target_sections = defaultdict(int)
+        self.internal_crossproperty_source_sections = defaultdict(int)
+        self.internal_crossproperty_target_pages = defaultdict(int)
+        self.internal_crossproperty_source_pages = defaultdict(int)
         self.internal_crossproperty_non_bot_referrals = 0
-        self.internal_crossproperty_non_bot_target_sections = Counter()
-        self.internal_crossproperty_non_bot_source_sections = Counter()
-        self.internal_crossproperty_non_bot_target_pages = Counter()
-        self.internal_crossproperty_non_bot_source_pages = Counter()
+        self.internal_crossproperty_non_bot_target_sections = defaultdict(int)
+        self.internal_crossproperty_non_bot_source_sections = defaultdict(int)
+        self.internal_crossproperty_non_bot_target_pages = defaultdict(int)
+        self.internal_crossproperty_non_bot_source_pages = defaultdict(int)
         self.internal_crossproperty_inferred_referrals = 0
-        self.internal_crossproperty_inferred_target_sections = Counter()
+        self.internal_crossproperty_inferred_target_sections = defaultdict(int)
         self.internal_crossproperty_inferred_non_bot_referrals = 0
-        self.internal_crossproperty_inferred_non_bot_target_sections = Counter()
+        self.internal_crossproperty_inferred_non_bot_target_sections = defaultdict(int)
         self.internal_crossproperty_inferred_verified_referrals = 0
-        self.internal_crossproperty_inferred_verified_target_sections = Counter()
+        self.internal_crossproperty_inferred_verified_target_sections = defaultdict(int)
         self.internal_crossproperty_inferred_non_bot_verified_referrals = 0
-        self.internal_crossproperty_inferred_non_bot_verified_target_sections = Counter()
+        self.internal_crossproperty_inferred_non_bot_verified_target_sections = defaultdict(int)
         self.internal_crossproperty_inferred_unverified_referrals = 0
-        self.internal_crossproperty_inferred_unverified_target_sections = Counter()
+        self.internal_crossproperty_inferred_unverified_target_sections = defaultdict(int)
         self.internal_crossproperty_inferred_non_bot_unverified_referrals = 0
-        self.internal_crossproperty_inferred_non_bot_unverified_target_sections = Counter()
+        self.internal_crossproperty_inferred_non_bot_unverified_target_sections = defaultdict(int)
         self.known_bot_requests = 0
         self.known_bot_unique_ips = set()
         self.crosspromo_known_bot_hits = 0
-        self.crosspromo_known_bot_user_agents = Counter()
+        self.crosspromo_known_bot_user_agents = defaultdict(int)
         self.crosspromo_hits_with_any_referrer = 0
         self.crosspromo_hits_without_referrer = 0
         self.crosspromo_non_bot_hits_with_any_referrer = 0
@@ -459,8 +1089,9 @@ class WindowStats:
         self.crosspromo_hits_without_referrer_known_bot = 0
         self.crosspromo_suspected_automation_hits = 0
         self.crosspromo_suspected_automation_unique_ips = set()
-        self.crosspromo_suspected_automation_user_agents = Counter()
-        self.recent_content_paths_by_client: dict[tuple[str, str], deque[tuple[datetime, str]]] = {}
+        self.crosspromo_suspected_automation_user_agents = defaultdict(int)
+        # Per client: arrival seconds and paths as parallel buffers, oldest first.
+        self.recent_content_paths_by_client: dict[tuple[str, str], tuple[array, list[str]]] = {}
 
     @staticmethod
     def _client_key(ip: str, normalized_user_agent: str) -> tuple[str, str]:
@@ -469,40 +1100,48 @@ class WindowStats:
         return (ip, "")
 
     @staticmethod
-    def _trim_recent_paths(paths: deque[tuple[datetime, str]], cutoff: datetime):
-        while paths and paths[0][0] < cutoff:
-            paths.popleft()
-
-    def _has_recent_inferred_source_match(self, client_key: tuple[str, str], inferred_paths: set[str], ts: datetime) -> bool:
+    def _trim_recent_paths(timestamps: array, paths: list[str], cutoff: int):
+        if not timestamps or timestamps[0] >= cutoff:
+            return
+        # Drop from the front until the first entry inside the lookback; later entries are kept as-is.
+        stale = 0
+        for seen_at in timestamps:
+            if seen_at >= cutoff:
+                break
+            stale += 1
+        del timestamps[:stale]
+        del paths[:stale]
+
+    def _has_recent_inferred_source_match(self, client_key: tuple[str, str], inferred_paths: set[str], ts: int) -> bool:
         if not inferred_paths:
             return False
-        recent_paths = self.recent_content_paths_by_client.get(client_key)
-        if not recent_paths:
-            return False
-        cutoff = ts - INFERRED_SOURCE_LOOKBACK
-        self._trim_recent_paths(recent_paths, cutoff)
-        if not recent_paths:
+        recent = self.recent_content_paths_by_client.get(client_key)
+        if recent is None:
             return False
-        for _, candidate_path in recent_paths:
-            if candidate_path in inferred_paths:
-                return True
-        return False
-
-    def _remember_recent_content_path(self, client_key: tuple[str, str], ts: datetime, path: str):
-        recent_paths = self.recent_content_paths_by_client.get(client_key)
-        if recent_paths is None:
-            recent_paths = deque()
-            self.recent_content_paths_by_client[client_key] = recent_paths
-        cutoff = ts - INFERRED_SOURCE_LOOKBACK
-        self._trim_recent_paths(recent_paths, cutoff)
-        recent_paths.append((ts, path))
-        while len(recent_paths) > INFERRED_SOURCE_MAX_RECENT_PATHS:
-            recent_paths.popleft()
-
-    def record(self, ip: str, status: str, referrer: str, path: str, query: str, user_agent: str, ts: datetime):
-        asset = is_asset_path(path)
-        suspicious_path = is_suspicious_path(path)
-        internal_referrer_path = parse_internal_referrer_path(referrer)
+        timestamps, paths = recent
+        self._trim_recent_paths(timestamps, paths, ts - INFERRED_SOURCE_LOOKBACK_SECONDS)
+        return not inferred_paths.isdisjoint(paths)
+
+    def _remember_recent_content_path(self, client_key: tuple[str, str], ts: int, path: str):
+        recent = self.recent_content_paths_by_client.get(client_key)
+        if recent is None:
+            recent = (array("q"), [])
+            self.recent_content_paths_by_client[client_key] = recent
+        timestamps, paths = recent
+        self._trim_recent_paths(timestamps, paths, ts - INFERRED_SOURCE_LOOKBACK_SECONDS)
+        timestamps.append(ts)
+        paths.append(path)
+        overflow = len(paths) - INFERRED_SOURCE_MAX_RECENT_PATHS
+        if overflow > 0:
+            del timestamps[:overflow]
+            del paths[:overflow]
+
+    def record(self, ip: str, status: str, referrer: str, path: str, query: str, user_agent: str, ts: int):
+        asset, suspicious_path, path_section = classify_path(path)
+        content_page = bool(path) and not asset
+        clean_content_page = content_page and not suspicious_path
+        internal_referrer_path, internal_referrer_section, engine = classify_referrer(referrer)
+        has_referrer = bool(referrer) and referrer != "-"
         normalized_user_agent = normalize_user_agent(user_agent)
         known_bot_ua = is_known_bot_user_agent(normalized_user_agent)
         client_key = self._client_key(ip, normalized_user_agent)
@@ -522,24 +1161,26 @@ class WindowStats:
         else:
             self.clean_requests += 1
             self.clean_unique_ips.add(ip)
-            if not asset and path:
+            if content_page:
                 self.content_requests += 1
                 self.content_unique_ips.add(ip)
-                section = classify_content_section(path)
-                self.content_section_counts[section] += 1
+                self.content_section_counts[path_section] += 1
 
-        if not asset and path:
+        if content_page:
             self.page_counts[path] += 1
             if status == "404":
+                self.not_found_requests += 1
                 self.not_found_pages[path] += 1
                 if suspicious_path:
+                    self.suspicious_not_found_requests += 1
                     self.suspicious_not_found_pages[path] += 1
                 else:
+                    self.clean_not_found_requests += 1
                     self.clean_not_found_pages[path] += 1
-            if f"utm_campaign={CROSSPROMO_CAMPAIGN_NAME}" in query and not is_crosspromo_redirect_hop(path):
+            if CROSSPROMO_CAMPAIGN_MARKER in query and not is_crosspromo_redirect_hop(path):
                 self.crosspromo_campaign_hits += 1
                 self.crosspromo_campaign_pages[path] += 1
-                target_section = classify_content_section(path)
+                target_section = path_section
                 suspected_crosspromo_automation = is_suspected_crosspromo_automation(
                     ip,
                     normalized_user_agent,
@@ -555,7 +1196,7 @@ class WindowStats:
                 self.crosspromo_campaign_target_sections[target_section] += 1
                 if not crosspromo_known_bot:
                     self.crosspromo_non_bot_campaign_target_sections[target_section] += 1
-                if referrer and referrer != "-":
+                if has_referrer:
                     self.crosspromo_hits_with_any_referrer += 1
                     if not crosspromo_known_bot:
                         self.crosspromo_non_bot_hits_with_any_referrer += 1
@@ -567,19 +1208,18 @@ class WindowStats:
                     self.crosspromo_known_bot_hits += 1
                     if normalized_user_agent:
                         self.crosspromo_known_bot_user_agents[normalized_user_agent] += 1
-                    if not referrer or referrer == "-":
+                    if not has_referrer:
                         self.crosspromo_hits_without_referrer_known_bot += 1
-                params = parse_qs(query, keep_blank_values=False)
                 inferred_source_paths: list[str] = []
-                for source in params.get("utm_content", []):
+                for source in parse_utm_content_values(query):
                     source = source.strip()
                     if not source:
                         continue
                     self.crosspromo_campaign_sources[source] += 1
-                    self.crosspromo_campaign_source_target_sections[f"{source}->{target_section}"] += 1
+                    self.crosspromo_campaign_source_target_sections[source, target_section] += 1
                     if not crosspromo_known_bot:
                         self.crosspromo_non_bot_campaign_sources[source] += 1
-                        self.crosspromo_non_bot_campaign_source_target_sections[f"{source}->{target_section}"] += 1
+                        self.crosspromo_non_bot_campaign_source_target_sections[source, target_section] += 1
                     inferred_source_path = infer_internal_source_path(source)
                     if inferred_source_path:
                         inferred_source_paths.append(inferred_source_path)
@@ -592,12 +1232,12 @@ class WindowStats:
                     self.crosspromo_hits_with_param_source += 1
                     if not crosspromo_known_bot:
                         self.crosspromo_non_bot_hits_with_param_source += 1
-                    if not referrer or referrer == "-":
+                    if not has_referrer:
                         self.crosspromo_hits_with_param_source_without_referrer += 1
                         if not crosspromo_known_bot:
                             self.crosspromo_non_bot_hits_with_param_source_without_referrer += 1
                     for normalized_source_path in normalized_inferred_paths:
-                        source_section = classify_content_section(normalized_source_path)
+                        source_section = classify_normalized_section(normalized_source_path)
                         self.crosspromo_campaign_param_source_pages[normalized_source_path] += 1
                         self.crosspromo_campaign_param_source_sections[source_section] += 1
                         if not crosspromo_known_bot:
@@ -605,15 +1245,15 @@ class WindowStats:
                             self.crosspromo_non_bot_campaign_param_source_sections[source_section] += 1
                 if internal_referrer_path:
                     self.crosspromo_hits_with_internal_referrer += 1
-                    source_section = classify_content_section(internal_referrer_path)
+                    source_section = internal_referrer_section
                     self.crosspromo_campaign_source_pages[internal_referrer_path] += 1
                     self.crosspromo_campaign_source_sections[source_section] += 1
-                    self.crosspromo_campaign_page_path_pairs[f"{internal_referrer_path}->{path}"] += 1
+                    self.crosspromo_campaign_page_path_pairs[internal_referrer_path, path] += 1
                     if not crosspromo_known_bot:
                         self.crosspromo_non_bot_hits_with_internal_referrer += 1
                         self.crosspromo_non_bot_campaign_source_pages[internal_referrer_path] += 1
                         self.crosspromo_non_bot_campaign_source_sections[source_section] += 1
-                        self.crosspromo_non_bot_campaign_page_path_pairs[f"{internal_referrer_path}->{path}"] += 1
+                        self.crosspromo_non_bot_campaign_page_path_pairs[internal_referrer_path, path] += 1
                     if normalized_inferred_paths and internal_referrer_path not in normalized_inferred_paths:
                         self.crosspromo_source_mismatch_hits += 1
                 elif inferred_source_paths:
@@ -636,7 +1276,7 @@ class WindowStats:
                         if not normalized_source_path or normalized_source_path in recorded_paths:
                             continue
                         recorded_paths.add(normalized_source_path)
-                        source_section = classify_content_section(normalized_source_path)
+                        source_section = classify_normalized_section(normalized_source_path)
                         if (
                             not inferred_internal_crossproperty_recorded
                             and target_section in INTERNAL_CROSSPROPERTY_TARGETS
@@ -662,33 +1302,35 @@ class WindowStats:
                             inferred_internal_crossproperty_recorded = True
                         self.crosspromo_campaign_source_pages[normalized_source_path] += 1
                         self.crosspromo_campaign_source_sections[source_section] += 1
-                        self.crosspromo_campaign_page_path_pairs[f"{normalized_source_path}->{path}"] += 1
+                        self.crosspromo_campaign_page_path_pairs[normalized_source_path, path] += 1
                         if not crosspromo_known_bot:
                             self.crosspromo_non_bot_campaign_source_pages[normalized_source_path] += 1
                             self.crosspromo_non_bot_campaign_source_sections[source_section] += 1
-                            self.crosspromo_non_bot_campaign_page_path_pairs[f"{normalized_source_path}->{path}"] += 1
+                            self.crosspromo_non_bot_campaign_page_path_pairs[normalized_source_path, path] += 1
                 else:
                     self.crosspromo_hits_unattributed += 1
                     if not crosspromo_known_bot:
                         self.crosspromo_non_bot_hits_unattributed += 1
 
-        if referrer and referrer != "-":
+        if has_referrer:
             if not internal_referrer_path:
                 self.external_referrers[referrer] += 1
-            engine = detect_engine(referrer)
-            if engine and not asset and path and not suspicious_path:
+            if engine and clean_content_page:
+                self.organic_referrals += 1
                 self.organic_engine_counts[engine] += 1
                 self.organic_page_counts[path] += 1
-                section = classify_content_section(path)
-                self.organic_section_counts[section] += 1
+                self.organic_section_counts[path_section] += 1
                 if not known_bot_ua:
+                    self.organic_non_bot_referrals += 1
                     self.organic_non_bot_engine_counts[engine] += 1
                     self.organic_non_bot_page_counts[path] += 1
-                    self.organic_non_bot_section_counts[section] += 1
+                    self.organic_non_bot_section_counts[path_section] += 1
+                    if path_section in KIT_SECTION_NAME_SET:
+                        self.organic_non_bot_kit_page_counts[path] += 1
 
-        if internal_referrer_path and not asset and path and not suspicious_path:
-            source_section = classify_content_section(internal_referrer_path)
-            target_section = classify_content_section(path)
+        if internal_referrer_path and clean_content_page:
+            source_section = internal_referrer_section
+            target_section = path_section
             if target_section in INTERNAL_CROSSPROPERTY_TARGETS and source_section != target_section:
                 self.internal_crossproperty_referrals += 1
                 self.internal_crossproperty_target_sections[target_section] += 1
@@ -702,210 +1344,68 @@ class WindowStats:
                     self.internal_crossproperty_non_bot_target_pages[path] += 1
                     self.internal_crossproperty_non_bot_source_pages[internal_referrer_path] += 1
 
-        if not asset and path and not suspicious_path:
+        if clean_content_page:
             self._remember_recent_content_path(client_key, ts, path)
 
     def summary(self, generated_at: str, window_hours: int):
-        organic_total = sum(self.organic_engine_counts.values())
-        organic_non_bot_total = sum(self.organic_non_bot_engine_counts.values())
-        not_found_total = sum(self.not_found_pages.values())
-        clean_404 = sum(self.clean_not_found_pages.values())
-        suspicious_404 = sum(self.suspicious_not_found_pages.values())
-        content_sections = {name: int(self.content_section_counts.get(name, 0)) for name in CONTENT_SECTION_NAMES}
-        organic_sections = {name: int(self.organic_section_counts.get(name, 0)) for name in CONTENT_SECTION_NAMES}
-        organic_non_bot_sections = {name: int(self.organic_non_bot_section_counts.get(name, 0)) for name in CONTENT_SECTION_NAMES}
-        content_section_share = {name: safe_ratio(content_sections[name], self.content_requests) for name in CONTENT_SECTION_NAMES}
-        organic_section_share = {name: safe_ratio(organic_sections[name], organic_total) for name in CONTENT_SECTION_NAMES}
-        organic_non_bot_section_share = {
-            name: safe_ratio(organic_non_bot_sections[name], organic_non_bot_total) for name in CONTENT_SECTION_NAMES
-        }
+        organic_total = self.organic_referrals
+        organic_non_bot_total = self.organic_non_bot_referrals
+        not_found_total = self.not_found_requests
+        clean_404 = self.clean_not_found_requests
+        suspicious_404 = self.suspicious_not_found_requests
+        content_sections = {}
+        organic_sections = {}
+        organic_non_bot_sections = {}
+        content_section_share = {}
+        organic_section_share = {}
+        organic_non_bot_section_share = {}
+        # Start below zero so the first section wins an all-zero window, as max() would.
+        top_content_section, top_content_section_requests = "other", -1
+        top_organic_section, top_organic_section_referrals = "other", -1
+        top_organic_non_bot_section, top_organic_non_bot_section_referrals = "other", -1
+        for name in CONTENT_SECTION_NAMES:
+            content_count = self.content_section_counts.get(name, 0)
+            organic_count = self.organic_section_counts.get(name, 0)
+            organic_non_bot_count = self.organic_non_bot_section_counts.get(name, 0)
+            content_sections[name] = content_count
+            organic_sections[name] = organic_count
+            organic_non_bot_sections[name] = organic_non_bot_count
+            content_section_share[name] = safe_ratio(content_count, self.content_requests)
+            organic_section_share[name] = safe_ratio(organic_count, organic_total)
+            organic_non_bot_section_share[name] = safe_ratio(organic_non_bot_count, organic_non_bot_total)
+            if content_count > top_content_section_requests:
+                top_content_section, top_content_section_requests = name, content_count
+            if organic_count > top_organic_section_referrals:
+                top_organic_section, top_organic_section_referrals = name, organic_count
+            if organic_non_bot_count > top_organic_non_bot_section_referrals:
+                top_organic_non_bot_section, top_organic_non_bot_section_referrals = name, organic_non_bot_count
         organic_kit_referrals = sum(organic_sections[name] for name in KIT_SECTION_NAMES)
         organic_non_bot_kit_referrals = sum(organic_non_bot_sections[name] for name in KIT_SECTION_NAMES)
-        organic_non_bot_kit_page_counts = Counter()
-        for page_path, count in self.organic_non_bot_page_counts.items():
-            if classify_content_section(page_path) in KIT_SECTION_NAMES:
-                organic_non_bot_kit_page_counts[page_path] = count
-
-        top_content_section = "other"
-        top_content_section_requests = 0
-        top_organic_section = "other"
-        top_organic_section_referrals = 0
-        top_organic_non_bot_section = "other"
-        top_organic_non_bot_section_referrals = 0
+
         top_organic_non_bot_page = ""
         top_organic_non_bot_page_hits = 0
         top_organic_non_bot_kit_section = "other"
         top_organic_non_bot_kit_section_referrals = 0
         top_organic_non_bot_kit_page = ""
         top_organic_non_bot_kit_page_hits = 0
-        internal_to_datekit = int(self.internal_crossproperty_target_sections.get("datekit", 0))
-        internal_to_budgetkit = int(self.internal_crossproperty_target_sections.get("budgetkit", 0))
-        internal_to_healthkit = int(self.internal_crossproperty_target_sections.get("healthkit", 0))
-        internal_to_sleepkit = int(self.internal_crossproperty_target_sections.get("sleepkit", 0))
-        internal_to_focuskit = int(self.internal_crossproperty_target_sections.get("focuskit", 0))
-        internal_to_opskit = int(self.internal_crossproperty_target_sections.get("opskit", 0))
-        internal_to_studykit = int(self.internal_crossproperty_target_sections.get("studykit", 0))
-        internal_to_careerkit = int(self.internal_crossproperty_target_sections.get("careerkit", 0))
-        internal_to_housingkit = int(self.internal_crossproperty_target_sections.get("housingkit", 0))
-        internal_to_taxkit = int(self.internal_crossproperty_target_sections.get("taxkit", 0))
-        internal_non_bot_to_datekit = int(self.internal_crossproperty_non_bot_target_sections.get("datekit", 0))
-        internal_non_bot_to_budgetkit = int(self.internal_crossproperty_non_bot_target_sections.get("budgetkit", 0))
-        internal_non_bot_to_healthkit = int(self.internal_crossproperty_non_bot_target_sections.get("healthkit", 0))
-        internal_non_bot_to_sleepkit = int(self.internal_crossproperty_non_bot_target_sections.get("sleepkit", 0))
-        internal_non_bot_to_focuskit = int(self.internal_crossproperty_non_bot_target_sections.get("focuskit", 0))
-        internal_non_bot_to_opskit = int(self.internal_crossproperty_non_bot_target_sections.get("opskit", 0))
-        internal_non_bot_to_studykit = int(self.internal_crossproperty_non_bot_target_sections.get("studykit", 0))
-        internal_non_bot_to_careerkit = int(self.internal_crossproperty_non_bot_target_sections.get("careerkit", 0))
-        internal_non_bot_to_housingkit = int(self.internal_crossproperty_non_bot_target_sections.get("housingkit", 0))
-        internal_non_bot_to_taxkit = int(self.internal_crossproperty_non_bot_target_sections.get("taxkit", 0))
-        internal_inferred_to_datekit = int(self.internal_crossproperty_inferred_target_sections.get("datekit", 0))
-        internal_inferred_to_budgetkit = int(self.internal_crossproperty_inferred_target_sections.get("budgetkit", 0))
-        internal_inferred_to_healthkit = int(self.internal_crossproperty_inferred_target_sections.get("healthkit", 0))
-        internal_inferred_to_sleepkit = int(self.internal_crossproperty_inferred_target_sections.get("sleepkit", 0))
-        internal_inferred_to_focuskit = int(self.internal_crossproperty_inferred_target_sections.get("focuskit", 0))
-        internal_inferred_to_opskit = int(self.internal_crossproperty_inferred_target_sections.get("opskit", 0))
-        internal_inferred_to_studykit = int(self.internal_crossproperty_inferred_target_sections.get("studykit", 0))
-        internal_inferred_to_careerkit = int(self.internal_crossproperty_inferred_target_sections.get("careerkit", 0))
-        internal_inferred_to_housingkit = int(self.internal_crossproperty_inferred_target_sections.get("housingkit", 0))
-        internal_inferred_to_taxkit = int(self.internal_crossproperty_inferred_target_sections.get("taxkit", 0))
-        internal_inferred_non_bot_to_datekit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("datekit", 0)
-        )
-        internal_inferred_non_bot_to_budgetkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("budgetkit", 0)
-        )
-        internal_inferred_non_bot_to_healthkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("healthkit", 0)
-        )
-        internal_inferred_non_bot_to_sleepkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("sleepkit", 0)
-        )
-        internal_inferred_non_bot_to_focuskit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("focuskit", 0)
-        )
-        internal_inferred_non_bot_to_opskit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("opskit", 0)
-        )
-        internal_inferred_non_bot_to_studykit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("studykit", 0)
-        )
-        internal_inferred_non_bot_to_careerkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("careerkit", 0)
-        )
-        internal_inferred_non_bot_to_housingkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("housingkit", 0)
-        )
-        internal_inferred_non_bot_to_taxkit = int(
-            self.internal_crossproperty_inferred_non_bot_target_sections.get("taxkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_datekit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("datekit", 0)
-        )
-        internal_inferred_non_bot_verified_to_budgetkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("budgetkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_healthkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("healthkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_sleepkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("sleepkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_focuskit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("focuskit", 0)
+        internal_to = kit_section_counts(self.internal_crossproperty_target_sections)
+        internal_non_bot_to = kit_section_counts(self.internal_crossproperty_non_bot_target_sections)
+        internal_inferred_to = kit_section_counts(self.internal_crossproperty_inferred_target_sections)
+        internal_inferred_non_bot_to = kit_section_counts(self.internal_crossproperty_inferred_non_bot_target_sections)
+        internal_inferred_non_bot_verified_to = kit_section_counts(
+            self.internal_crossproperty_inferred_non_bot_verified_target_sections
         )
-        internal_inferred_non_bot_verified_to_opskit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("opskit", 0)
-        )
-        internal_inferred_non_bot_verified_to_studykit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("studykit", 0)
-        )
-        internal_inferred_non_bot_verified_to_careerkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("careerkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_housingkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("housingkit", 0)
-        )
-        internal_inferred_non_bot_verified_to_taxkit = int(
-            self.internal_crossproperty_inferred_non_bot_verified_target_sections.get("taxkit", 0)
-        )
-        internal_high_confidence_non_bot_to_datekit = (
-            internal_non_bot_to_datekit + internal_inferred_non_bot_verified_to_datekit
-        )
-        internal_high_confidence_non_bot_to_budgetkit = (
-            internal_non_bot_to_budgetkit + internal_inferred_non_bot_verified_to_budgetkit
-        )
-        internal_high_confidence_non_bot_to_healthkit = (
-            internal_non_bot_to_healthkit + internal_inferred_non_bot_verified_to_healthkit
-        )
-        internal_high_confidence_non_bot_to_sleepkit = (
-            internal_non_bot_to_sleepkit + internal_inferred_non_bot_verified_to_sleepkit
-        )
-        internal_high_confidence_non_bot_to_focuskit = (
-            internal_non_bot_to_focuskit + internal_inferred_non_bot_verified_to_focuskit
-        )
-        internal_high_confidence_non_bot_to_opskit = (
-            internal_non_bot_to_opskit + internal_inferred_non_bot_verified_to_opskit
-        )
-        internal_high_confidence_non_bot_to_studykit = (
-            internal_non_bot_to_studykit + internal_inferred_non_bot_verified_to_studykit
-        )
-        internal_high_confidence_non_bot_to_careerkit = (
-            internal_non_bot_to_careerkit + internal_inferred_non_bot_verified_to_careerkit
-        )
-        internal_high_confidence_non_bot_to_housingkit = (
-            internal_non_bot_to_housingkit + internal_inferred_non_bot_verified_to_housingkit
-        )
-        internal_high_confidence_non_bot_to_taxkit = (
-            internal_non_bot_to_taxkit + internal_inferred_non_bot_verified_to_taxkit
-        )
-        internal_effective_to_datekit = internal_to_datekit + internal_inferred_to_datekit
-        internal_effective_to_budgetkit = internal_to_budgetkit + internal_inferred_to_budgetkit
-        internal_effective_to_healthkit = internal_to_healthkit + internal_inferred_to_healthkit
-        internal_effective_to_sleepkit = internal_to_sleepkit + internal_inferred_to_sleepkit
-        internal_effective_to_focuskit = internal_to_focuskit + internal_inferred_to_focuskit
-        internal_effective_to_opskit = internal_to_opskit + internal_inferred_to_opskit
-        internal_effective_to_studykit = internal_to_studykit + internal_inferred_to_studykit
-        internal_effective_to_careerkit = internal_to_careerkit + internal_inferred_to_careerkit
-        internal_effective_to_housingkit = internal_to_housingkit + internal_inferred_to_housingkit
-        internal_effective_to_taxkit = internal_to_taxkit + internal_inferred_to_taxkit
-        internal_effective_non_bot_to_datekit = internal_non_bot_to_datekit + internal_inferred_non_bot_to_datekit
-        internal_effective_non_bot_to_budgetkit = internal_non_bot_to_budgetkit + internal_inferred_non_bot_to_budgetkit
-        internal_effective_non_bot_to_healthkit = internal_non_bot_to_healthkit + internal_inferred_non_bot_to_healthkit
-        internal_effective_non_bot_to_sleepkit = internal_non_bot_to_sleepkit + internal_inferred_non_bot_to_sleepkit
-        internal_effective_non_bot_to_focuskit = internal_non_bot_to_focuskit + internal_inferred_non_bot_to_focuskit
-        internal_effective_non_bot_to_opskit = internal_non_bot_to_opskit + internal_inferred_non_bot_to_opskit
-        internal_effective_non_bot_to_studykit = internal_non_bot_to_studykit + internal_inferred_non_bot_to_studykit
-        internal_effective_non_bot_to_careerkit = internal_non_bot_to_careerkit + internal_inferred_non_bot_to_careerkit
-        internal_effective_non_bot_to_housingkit = (
-            internal_non_bot_to_housingkit + internal_inferred_non_bot_to_housingkit
-        )
-        internal_effective_non_bot_to_taxkit = internal_non_bot_to_taxkit + internal_inferred_non_bot_to_taxkit
+        internal_high_confidence_non_bot_to = tuple(map(add, internal_non_bot_to, internal_inferred_non_bot_verified_to))
+        internal_effective_to = tuple(map(add, internal_to, internal_inferred_to))
+        internal_effective_non_bot_to = tuple(map(add, internal_non_bot_to, internal_inferred_non_bot_to))
         internal_crossproperty_effective_referrals = (
             self.internal_crossproperty_referrals + self.internal_crossproperty_inferred_referrals
         )
         internal_crossproperty_effective_non_bot_referrals = (
             self.internal_crossproperty_non_bot_referrals + self.internal_crossproperty_inferred_non_bot_referrals
         )
-        crosspromo_to_datekit = int(self.crosspromo_campaign_target_sections.get("datekit", 0))
-        crosspromo_to_budgetkit = int(self.crosspromo_campaign_target_sections.get("budgetkit", 0))
-        crosspromo_to_healthkit = int(self.crosspromo_campaign_target_sections.get("healthkit", 0))
-        crosspromo_to_sleepkit = int(self.crosspromo_campaign_target_sections.get("sleepkit", 0))
-        crosspromo_to_focuskit = int(self.crosspromo_campaign_target_sections.get("focuskit", 0))
-        crosspromo_to_opskit = int(self.crosspromo_campaign_target_sections.get("opskit", 0))
-        crosspromo_to_studykit = int(self.crosspromo_campaign_target_sections.get("studykit", 0))
-        crosspromo_to_careerkit = int(self.crosspromo_campaign_target_sections.get("careerkit", 0))
-        crosspromo_to_housingkit = int(self.crosspromo_campaign_target_sections.get("housingkit", 0))
-        crosspromo_to_taxkit = int(self.crosspromo_campaign_target_sections.get("taxkit", 0))
-        crosspromo_non_bot_to_datekit = int(self.crosspromo_non_bot_campaign_target_sections.get("datekit", 0))
-        crosspromo_non_bot_to_budgetkit = int(self.crosspromo_non_bot_campaign_target_sections.get("budgetkit", 0))
-        crosspromo_non_bot_to_healthkit = int(self.crosspromo_non_bot_campaign_target_sections.get("healthkit", 0))
-        crosspromo_non_bot_to_sleepkit = int(self.crosspromo_non_bot_campaign_target_sections.get("sleepkit", 0))
-        crosspromo_non_bot_to_focuskit = int(self.crosspromo_non_bot_campaign_target_sections.get("focuskit", 0))
-        crosspromo_non_bot_to_opskit = int(self.crosspromo_non_bot_campaign_target_sections.get("opskit", 0))
-        crosspromo_non_bot_to_studykit = int(self.crosspromo_non_bot_campaign_target_sections.get("studykit", 0))
-        crosspromo_non_bot_to_careerkit = int(self.crosspromo_non_bot_campaign_target_sections.get("careerkit", 0))
-        crosspromo_non_bot_to_housingkit = int(self.crosspromo_non_bot_campaign_target_sections.get("housingkit", 0))
-        crosspromo_non_bot_to_taxkit = int(self.crosspromo_non_bot_campaign_target_sections.get("taxkit", 0))
+        crosspromo_to = kit_section_counts(self.crosspromo_campaign_target_sections)
+        crosspromo_non_bot_to = kit_section_counts(self.crosspromo_non_bot_campaign_target_sections)
         crosspromo_param_source_hits = self.crosspromo_hits_with_param_source
         crosspromo_non_bot_param_source_hits = self.crosspromo_non_bot_hits_with_param_source
         crosspromo_param_source_without_referrer_hits = self.crosspromo_hits_with_param_source_without_referrer
@@ -966,69 +1466,60 @@ class WindowStats:
         top_crosspromo_non_bot_source_target_hits = 0
         top_crosspromo_non_bot_page_pair = ""
         top_crosspromo_non_bot_page_pair_hits = 0
-        if content_sections:
-            top_content_section, top_content_section_requests = max(content_sections.items(), key=lambda item: item[1])
-        if organic_sections:
-            top_organic_section, top_organic_section_referrals = max(organic_sections.items(), key=lambda item: item[1])
-        if organic_non_bot_sections:
-            top_organic_non_bot_section, top_organic_non_bot_section_referrals = max(
-                organic_non_bot_sections.items(),
-                key=lambda item: item[1],
-            )
         if self.organic_non_bot_page_counts:
             top_organic_non_bot_page, top_organic_non_bot_page_hits = max(
                 self.organic_non_bot_page_counts.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if organic_non_bot_kit_referrals > 0:
             top_organic_non_bot_kit_section, top_organic_non_bot_kit_section_referrals = max(
                 ((name, organic_non_bot_sections[name]) for name in KIT_SECTION_NAMES),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
-        if organic_non_bot_kit_page_counts:
+        if self.organic_non_bot_kit_page_counts:
             top_organic_non_bot_kit_page, top_organic_non_bot_kit_page_hits = max(
-                organic_non_bot_kit_page_counts.items(),
-                key=lambda item: item[1],
+                self.organic_non_bot_kit_page_counts.items(),
+                key=itemgetter(1),
             )
         if self.internal_crossproperty_source_sections:
             top_internal_source_section, top_internal_source_referrals = max(
                 self.internal_crossproperty_source_sections.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.internal_crossproperty_non_bot_source_sections:
             top_internal_non_bot_source_section, top_internal_non_bot_source_referrals = max(
                 self.internal_crossproperty_non_bot_source_sections.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_campaign_sources:
             top_crosspromo_source, top_crosspromo_source_hits = max(
                 self.crosspromo_campaign_sources.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_campaign_source_pages:
             top_crosspromo_source_page, top_crosspromo_source_page_hits = max(
                 self.crosspromo_campaign_source_pages.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_campaign_target_sections:
             top_crosspromo_target_section, top_crosspromo_target_hits = max(
                 self.crosspromo_campaign_target_sections.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_campaign_source_target_sections:
             top_crosspromo_source_target, top_crosspromo_source_target_hits = max(
-                self.crosspromo_campaign_source_target_sections.items(),
-                key=lambda item: item[1],
+                join_pair_counts(self.crosspromo_campaign_source_target_sections).items(),
+                key=itemgetter(1),
             )
         if self.crosspromo_campaign_page_path_pairs:
             top_crosspromo_page_pair, top_crosspromo_page_pair_hits = max(
-                self.crosspromo_campaign_page_path_pairs.items(),
-                key=lambda item: item[1],
+                join_pair_counts(self.crosspromo_campaign_page_path_pairs).items(),
+                key=itemgetter(1),
             )
         if self.crosspromo_known_bot_user_agents:
             top_crosspromo_known_bot_user_agent, top_crosspromo_known_bot_user_agent_hits = max(
                 self.crosspromo_known_bot_user_agents.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_suspected_automation_user_agents:
             (
@@ -1036,32 +1527,32 @@ class WindowStats:
                 top_crosspromo_suspected_automation_user_agent_hits,
             ) = max(
                 self.crosspromo_suspected_automation_user_agents.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_non_bot_campaign_sources:
             top_crosspromo_non_bot_source, top_crosspromo_non_bot_source_hits = max(
                 self.crosspromo_non_bot_campaign_sources.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_non_bot_campaign_source_pages:
             top_crosspromo_non_bot_source_page, top_crosspromo_non_bot_source_page_hits = max(
                 self.crosspromo_non_bot_campaign_source_pages.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_non_bot_campaign_target_sections:
             top_crosspromo_non_bot_target_section, top_crosspromo_non_bot_target_hits = max(
                 self.crosspromo_non_bot_campaign_target_sections.items(),
-                key=lambda item: item[1],
+                key=itemgetter(1),
             )
         if self.crosspromo_non_bot_campaign_source_target_sections:
             top_crosspromo_non_bot_source_target, top_crosspromo_non_bot_source_target_hits = max(
-                self.crosspromo_non_bot_campaign_source_target_sections.items(),
-                key=lambda item: item[1],
+                join_pair_counts(self.crosspromo_non_bot_campaign_source_target_sections).items(),
+                key=itemgetter(1),
             )
         if self.crosspromo_non_bot_campaign_page_path_pairs:
             top_crosspromo_non_bot_page_pair, top_crosspromo_non_bot_page_pair_hits = max(
-                self.crosspromo_non_bot_campaign_page_path_pairs.items(),
-                key=lambda item: item[1],
+                join_pair_counts(self.crosspromo_non_bot_campaign_page_path_pairs).items(),
+                key=itemgetter(1),
             )
 
         summary = {
@@ -1083,26 +1574,8 @@ class WindowStats:
             "organic_kit_referrals": organic_kit_referrals,
             "organic_non_bot_kit_referrals": organic_non_bot_kit_referrals,
             "crosspromo_campaign_hits": self.crosspromo_campaign_hits,
-            "crosspromo_campaign_hits_to_datekit": crosspromo_to_datekit,
-            "crosspromo_campaign_hits_to_budgetkit": crosspromo_to_budgetkit,
-            "crosspromo_campaign_hits_to_healthkit": crosspromo_to_healthkit,
-            "crosspromo_campaign_hits_to_sleepkit": crosspromo_to_sleepkit,
-            "crosspromo_campaign_hits_to_focuskit": crosspromo_to_focuskit,
-            "crosspromo_campaign_hits_to_opskit": crosspromo_to_opskit,
-            "crosspromo_campaign_hits_to_studykit": crosspromo_to_studykit,
-            "crosspromo_campaign_hits_to_careerkit": crosspromo_to_careerkit,
-            "crosspromo_campaign_hits_to_housingkit": crosspromo_to_housingkit,
-            "crosspromo_campaign_hits_to_taxkit": crosspromo_to_taxkit,
-            "crosspromo_non_bot_hits_to_datekit": crosspromo_non_bot_to_datekit,
-            "crosspromo_non_bot_hits_to_budgetkit": crosspromo_non_bot_to_budgetkit,
-            "crosspromo_non_bot_hits_to_healthkit": crosspromo_non_bot_to_healthkit,
-            "crosspromo_non_bot_hits_to_sleepkit": crosspromo_non_bot_to_sleepkit,
-            "crosspromo_non_bot_hits_to_focuskit": crosspromo_non_bot_to_focuskit,
-            "crosspromo_non_bot_hits_to_opskit": crosspromo_non_bot_to_opskit,
-            "crosspromo_non_bot_hits_to_studykit": crosspromo_non_bot_to_studykit,
-            "crosspromo_non_bot_hits_to_careerkit": crosspromo_non_bot_to_careerkit,
-            "crosspromo_non_bot_hits_to_housingkit": crosspromo_non_bot_to_housingkit,
-            "crosspromo_non_bot_hits_to_taxkit": crosspromo_non_bot_to_taxkit,
+            **kit_fields("crosspromo_campaign_hits_to", crosspromo_to),
+            **kit_fields("crosspromo_non_bot_hits_to", crosspromo_non_bot_to),
             "crosspromo_source_attributed_hits": crosspromo_source_attributed_hits,
             "crosspromo_hits_with_param_source": crosspromo_param_source_hits,
             "crosspromo_non_bot_hits_with_param_source": crosspromo_non_bot_param_source_hits,
@@ -1138,108 +1611,25 @@ class WindowStats:
             "crosspromo_suspected_automation_unique_ips": crosspromo_suspected_automation_unique_ips,
             "crosspromo_source_mismatch_hits": self.crosspromo_source_mismatch_hits,
             "internal_crossproperty_referrals": self.internal_crossproperty_referrals,
-            "internal_crossproperty_referrals_to_datekit": internal_to_datekit,
-            "internal_crossproperty_referrals_to_budgetkit": internal_to_budgetkit,
-            "internal_crossproperty_referrals_to_healthkit": internal_to_healthkit,
-            "internal_crossproperty_referrals_to_sleepkit": internal_to_sleepkit,
-            "internal_crossproperty_referrals_to_focuskit": internal_to_focuskit,
-            "internal_crossproperty_referrals_to_opskit": internal_to_opskit,
-            "internal_crossproperty_referrals_to_studykit": internal_to_studykit,
-            "internal_crossproperty_referrals_to_careerkit": internal_to_careerkit,
-            "internal_crossproperty_referrals_to_housingkit": internal_to_housingkit,
-            "internal_crossproperty_referrals_to_taxkit": internal_to_taxkit,
+            **kit_fields("internal_crossproperty_referrals_to", internal_to),
             "internal_crossproperty_non_bot_referrals": self.internal_crossproperty_non_bot_referrals,
-            "internal_crossproperty_non_bot_referrals_to_datekit": internal_non_bot_to_datekit,
-            "internal_crossproperty_non_bot_referrals_to_budgetkit": internal_non_bot_to_budgetkit,
-            "internal_crossproperty_non_bot_referrals_to_healthkit": internal_non_bot_to_healthkit,
-            "internal_crossproperty_non_bot_referrals_to_sleepkit": internal_non_bot_to_sleepkit,
-            "internal_crossproperty_non_bot_referrals_to_focuskit": internal_non_bot_to_focuskit,
-            "internal_crossproperty_non_bot_referrals_to_opskit": internal_non_bot_to_opskit,
-            "internal_crossproperty_non_bot_referrals_to_studykit": internal_non_bot_to_studykit,
-            "internal_crossproperty_non_bot_referrals_to_careerkit": internal_non_bot_to_careerkit,
-            "internal_crossproperty_non_bot_referrals_to_housingkit": internal_non_bot_to_housingkit,
-            "internal_crossproperty_non_bot_referrals_to_taxkit": internal_non_bot_to_taxkit,
+            **kit_fields("internal_crossproperty_non_bot_referrals_to", internal_non_bot_to),
             "internal_crossproperty_inferred_referrals": self.internal_crossproperty_inferred_referrals,
-            "internal_crossproperty_inferred_referrals_to_datekit": internal_inferred_to_datekit,
-            "internal_crossproperty_inferred_referrals_to_budgetkit": internal_inferred_to_budgetkit,
-            "internal_crossproperty_inferred_referrals_to_healthkit": internal_inferred_to_healthkit,
-            "internal_crossproperty_inferred_referrals_to_sleepkit": internal_inferred_to_sleepkit,
-            "internal_crossproperty_inferred_referrals_to_focuskit": internal_inferred_to_focuskit,
-            "internal_crossproperty_inferred_referrals_to_opskit": internal_inferred_to_opskit,
-            "internal_crossproperty_inferred_referrals_to_studykit": internal_inferred_to_studykit,
-            "internal_crossproperty_inferred_referrals_to_careerkit": internal_inferred_to_careerkit,
-            "internal_crossproperty_inferred_referrals_to_housingkit": internal_inferred_to_housingkit,
-            "internal_crossproperty_inferred_referrals_to_taxkit": internal_inferred_to_taxkit,
+            **kit_fields("internal_crossproperty_inferred_referrals_to", internal_inferred_to),
             "internal_crossproperty_inferred_non_bot_referrals": self.internal_crossproperty_inferred_non_bot_referrals,
-            "internal_crossproperty_inferred_non_bot_referrals_to_datekit": internal_inferred_non_bot_to_datekit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_budgetkit": internal_inferred_non_bot_to_budgetkit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_healthkit": internal_inferred_non_bot_to_healthkit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_sleepkit": internal_inferred_non_bot_to_sleepkit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_focuskit": internal_inferred_non_bot_to_focuskit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_opskit": internal_inferred_non_bot_to_opskit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_studykit": internal_inferred_non_bot_to_studykit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_careerkit": internal_inferred_non_bot_to_careerkit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_housingkit": internal_inferred_non_bot_to_housingkit,
-            "internal_crossproperty_inferred_non_bot_referrals_to_taxkit": internal_inferred_non_bot_to_taxkit,
+            **kit_fields("internal_crossproperty_inferred_non_bot_referrals_to", internal_inferred_non_bot_to),
             "internal_crossproperty_inferred_verified_referrals": internal_inferred_verified_referrals,
             "internal_crossproperty_inferred_non_bot_verified_referrals": internal_inferred_non_bot_verified_referrals,
             "internal_crossproperty_inferred_unverified_referrals": internal_inferred_unverified_referrals,
             "internal_crossproperty_inferred_non_bot_unverified_referrals": internal_inferred_non_bot_unverified_referrals,
             "internal_crossproperty_effective_referrals": internal_crossproperty_effective_referrals,
-            "internal_crossproperty_effective_referrals_to_datekit": internal_effective_to_datekit,
-            "internal_crossproperty_effective_referrals_to_budgetkit": internal_effective_to_budgetkit,
-            "internal_crossproperty_effective_referrals_to_healthkit": internal_effective_to_healthkit,
-            "internal_crossproperty_effective_referrals_to_sleepkit": internal_effective_to_sleepkit,
-            "internal_crossproperty_effective_referrals_to_focuskit": internal_effective_to_focuskit,
-            "internal_crossproperty_effective_referrals_to_opskit": internal_effective_to_opskit,
-            "internal_crossproperty_effective_referrals_to_studykit": internal_effective_to_studykit,
-            "internal_crossproperty_effective_referrals_to_careerkit": internal_effective_to_careerkit,
-            "internal_crossproperty_effective_referrals_to_housingkit": internal_effective_to_housingkit,
-            "internal_crossproperty_effective_referrals_to_taxkit": internal_effective_to_taxkit,
+            **kit_fields("internal_crossproperty_effective_referrals_to", internal_effective_to),
             "internal_crossproperty_effective_non_bot_referrals": internal_crossproperty_effective_non_bot_referrals,
-            "internal_crossproperty_effective_non_bot_referrals_to_datekit": internal_effective_non_bot_to_datekit,
-            "internal_crossproperty_effective_non_bot_referrals_to_budgetkit": internal_effective_non_bot_to_budgetkit,
-            "internal_crossproperty_effective_non_bot_referrals_to_healthkit": internal_effective_non_bot_to_healthkit,
-            "internal_crossproperty_effective_non_bot_referrals_to_sleepkit": internal_effective_non_bot_to_sleepkit,
-            "internal_crossproperty_effective_non_bot_referrals_to_focuskit": internal_effective_non_bot_to_focuskit,
-            "internal_crossproperty_effective_non_bot_referrals_to_opskit": internal_effective_non_bot_to_opskit,
-            "internal_crossproperty_effective_non_bot_referrals_to_studykit": internal_effective_non_bot_to_studykit,
-            "internal_crossproperty_effective_non_bot_referrals_to_careerkit": internal_effective_non_bot_to_careerkit,
-            "internal_crossproperty_effective_non_bot_referrals_to_housingkit": internal_effective_non_bot_to_housingkit,
-            "internal_crossproperty_effective_non_bot_referrals_to_taxkit": internal_effective_non_bot_to_taxkit,
+            **kit_fields("internal_crossproperty_effective_non_bot_referrals_to", internal_effective_non_bot_to),
             "internal_crossproperty_high_confidence_non_bot_referrals": (
                 internal_crossproperty_high_confidence_non_bot_referrals
             ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_datekit": (
-                internal_high_confidence_non_bot_to_datekit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_budgetkit": (
-                internal_high_confidence_non_bot_to_budgetkit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_healthkit": (
-                internal_high_confidence_non_bot_to_healthkit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_sleepkit": (
-                internal_high_confidence_non_bot_to_sleepkit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_focuskit": (
-                internal_high_confidence_non_bot_to_focuskit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_opskit": (
-                internal_high_confidence_non_bot_to_opskit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_studykit": (
-                internal_high_confidence_non_bot_to_studykit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_careerkit": (
-                internal_high_confidence_non_bot_to_careerkit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_housingkit": (
-                internal_high_confidence_non_bot_to_housingkit
-            ),
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_taxkit": (
-                internal_high_confidence_non_bot_to_taxkit
-            ),
+            **kit_fields("internal_crossproperty_high_confidence_non_bot_referrals_to", internal_high_confidence_non_bot_to),
             "internal_crossproperty_low_confidence_non_bot_referrals": (
                 internal_crossproperty_low_confidence_non_bot_referrals
             ),
@@ -1401,10 +1791,10 @@ class WindowStats:
             "top_crosspromo_non_bot_page_pair": top_crosspromo_non_bot_page_pair,
             "top_crosspromo_non_bot_page_pair_hits": top_crosspromo_non_bot_page_pair_hits,
         }
-        for section_name in CONTENT_SECTION_NAMES:
-            summary[f"content_{section_name}_requests"] = content_sections[section_name]
-            summary[f"organic_{section_name}_referrals"] = organic_sections[section_name]
-            summary[f"organic_non_bot_{section_name}_referrals"] = organic_non_bot_sections[section_name]
+        for section_name, content_key, organic_key, organic_non_bot_key in SECTION_SUMMARY_KEYS:
+            summary[content_key] = content_sections[section_name]
+            summary[organic_key] = organic_sections[section_name]
+            summary[organic_non_bot_key] = organic_non_bot_sections[section_name]
         return summary
 
 
@@ -1415,199 +1805,8 @@ def build_window_comparison(
     current_end: datetime,
     previous_start: datetime,
 ):
-    metrics = [
-        "total_requests",
-        "unique_ips",
-        "clean_requests",
-        "content_requests",
-        "suspicious_requests",
-        "not_found_requests",
-        "clean_404",
-        "suspicious_404",
-        "organic_referrals",
-        "organic_non_bot_referrals",
-        "organic_kit_referrals",
-        "organic_non_bot_kit_referrals",
-        "crosspromo_campaign_hits",
-        "crosspromo_campaign_hits_to_datekit",
-        "crosspromo_campaign_hits_to_budgetkit",
-        "crosspromo_campaign_hits_to_healthkit",
-        "crosspromo_campaign_hits_to_sleepkit",
-        "crosspromo_campaign_hits_to_focuskit",
-        "crosspromo_campaign_hits_to_opskit",
-        "crosspromo_campaign_hits_to_studykit",
-        "crosspromo_campaign_hits_to_careerkit",
-        "crosspromo_campaign_hits_to_housingkit",
-        "crosspromo_campaign_hits_to_taxkit",
-        "crosspromo_non_bot_hits_to_datekit",
-        "crosspromo_non_bot_hits_to_budgetkit",
-        "crosspromo_non_bot_hits_to_healthkit",
-        "crosspromo_non_bot_hits_to_sleepkit",
-        "crosspromo_non_bot_hits_to_focuskit",
-        "crosspromo_non_bot_hits_to_opskit",
-        "crosspromo_non_bot_hits_to_studykit",
-        "crosspromo_non_bot_hits_to_careerkit",
-        "crosspromo_non_bot_hits_to_housingkit",
-        "crosspromo_non_bot_hits_to_taxkit",
-        "crosspromo_source_attributed_hits",
-        "crosspromo_non_bot_source_attributed_hits",
-        "crosspromo_hits_with_param_source",
-        "crosspromo_non_bot_hits_with_param_source",
-        "crosspromo_hits_with_param_source_without_referrer",
-        "crosspromo_non_bot_hits_with_param_source_without_referrer",
-        "crosspromo_hits_with_internal_referrer",
-        "crosspromo_hits_with_inferred_source",
-        "crosspromo_inferred_verified_hits",
-        "crosspromo_inferred_unverified_hits",
-        "crosspromo_hits_unattributed",
-        "crosspromo_non_bot_hits_with_internal_referrer",
-        "crosspromo_non_bot_hits_with_inferred_source",
-        "crosspromo_non_bot_inferred_verified_hits",
-        "crosspromo_non_bot_inferred_unverified_hits",
-        "crosspromo_non_bot_hits_unattributed",
-        "crosspromo_hits_with_any_referrer",
-        "crosspromo_hits_without_referrer",
-        "crosspromo_non_bot_hits_with_any_referrer",
-        "crosspromo_non_bot_hits_without_referrer",
-        "crosspromo_hits_without_referrer_known_bot",
-        "crosspromo_hits_without_referrer_non_bot",
-        "crosspromo_known_bot_hits",
-        "crosspromo_non_bot_hits",
-        "crosspromo_non_bot_high_confidence_hits",
-        "crosspromo_non_bot_low_confidence_hits",
-        "crosspromo_source_mismatch_hits",
-        "internal_crossproperty_referrals",
-        "internal_crossproperty_referrals_to_datekit",
-        "internal_crossproperty_referrals_to_budgetkit",
-        "internal_crossproperty_referrals_to_healthkit",
-        "internal_crossproperty_referrals_to_sleepkit",
-        "internal_crossproperty_referrals_to_focuskit",
-        "internal_crossproperty_referrals_to_opskit",
-        "internal_crossproperty_referrals_to_studykit",
-        "internal_crossproperty_referrals_to_careerkit",
-        "internal_crossproperty_referrals_to_housingkit",
-        "internal_crossproperty_referrals_to_taxkit",
-        "internal_crossproperty_non_bot_referrals",
-        "internal_crossproperty_non_bot_referrals_to_datekit",
-        "internal_crossproperty_non_bot_referrals_to_budgetkit",
-        "internal_crossproperty_non_bot_referrals_to_healthkit",
-        "internal_crossproperty_non_bot_referrals_to_sleepkit",
-        "internal_crossproperty_non_bot_referrals_to_focuskit",
-        "internal_crossproperty_non_bot_referrals_to_opskit",
-        "internal_crossproperty_non_bot_referrals_to_studykit",
-        "internal_crossproperty_non_bot_referrals_to_careerkit",
-        "internal_crossproperty_non_bot_referrals_to_housingkit",
-        "internal_crossproperty_non_bot_referrals_to_taxkit",
-        "internal_crossproperty_inferred_referrals",
-        "internal_crossproperty_inferred_referrals_to_datekit",
-        "internal_crossproperty_inferred_referrals_to_budgetkit",
-        "internal_crossproperty_inferred_referrals_to_healthkit",
-        "internal_crossproperty_inferred_referrals_to_sleepkit",
-        "internal_crossproperty_inferred_referrals_to_focuskit",
-        "internal_crossproperty_inferred_referrals_to_opskit",
-        "internal_crossproperty_inferred_referrals_to_studykit",
-        "internal_crossproperty_inferred_referrals_to_careerkit",
-        "internal_crossproperty_inferred_referrals_to_housingkit",
-        "internal_crossproperty_inferred_referrals_to_taxkit",
-        "internal_crossproperty_inferred_non_bot_referrals",
-        "internal_crossproperty_inferred_non_bot_referrals_to_datekit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_budgetkit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_healthkit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_sleepkit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_focuskit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_opskit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_studykit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_careerkit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_housingkit",
-        "internal_crossproperty_inferred_non_bot_referrals_to_taxkit",
-        "internal_crossproperty_inferred_verified_referrals",
-        "internal_crossproperty_inferred_non_bot_verified_referrals",
-        "internal_crossproperty_inferred_unverified_referrals",
-        "internal_crossproperty_inferred_non_bot_unverified_referrals",
-        "internal_crossproperty_effective_referrals",
-        "internal_crossproperty_effective_referrals_to_datekit",
-        "internal_crossproperty_effective_referrals_to_budgetkit",
-        "internal_crossproperty_effective_referrals_to_healthkit",
-        "internal_crossproperty_effective_referrals_to_sleepkit",
-        "internal_crossproperty_effective_referrals_to_focuskit",
-        "internal_crossproperty_effective_referrals_to_opskit",
-        "internal_crossproperty_effective_referrals_to_studykit",
-        "internal_crossproperty_effective_referrals_to_careerkit",
-        "internal_crossproperty_effective_referrals_to_housingkit",
-        "internal_crossproperty_effective_referrals_to_taxkit",
-        "internal_crossproperty_effective_non_bot_referrals",
-        "internal_crossproperty_effective_non_bot_referrals_to_datekit",
-        "internal_crossproperty_effective_non_bot_referrals_to_budgetkit",
-        "internal_crossproperty_effective_non_bot_referrals_to_healthkit",
-        "internal_crossproperty_effective_non_bot_referrals_to_sleepkit",
-        "internal_crossproperty_effective_non_bot_referrals_to_focuskit",
-        "internal_crossproperty_effective_non_bot_referrals_to_opskit",
-        "internal_crossproperty_effective_non_bot_referrals_to_studykit",
-        "internal_crossproperty_effective_non_bot_referrals_to_careerkit",
-        "internal_crossproperty_effective_non_bot_referrals_to_housingkit",
-        "internal_crossproperty_effective_non_bot_referrals_to_taxkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_datekit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_budgetkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_healthkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_sleepkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_focuskit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_opskit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_studykit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_careerkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_housingkit",
-        "internal_crossproperty_high_confidence_non_bot_referrals_to_taxkit",
-        "internal_crossproperty_low_confidence_non_bot_referrals",
-        "known_bot_requests",
-        "known_bot_unique_ips",
-        "content_homepage_requests",
-        "content_blog_requests",
-        "content_tools_requests",
-        "content_cheatsheets_requests",
-        "content_datekit_requests",
-        "content_budgetkit_requests",
-        "content_healthkit_requests",
-        "content_sleepkit_requests",
-        "content_focuskit_requests",
-        "content_opskit_requests",
-        "content_studykit_requests",
-        "content_careerkit_requests",
-        "content_housingkit_requests",
-        "content_taxkit_requests",
-        "content_other_requests",
-        "organic_homepage_referrals",
-        "organic_blog_referrals",
-        "organic_tools_referrals",
-        "organic_cheatsheets_referrals",
-        "organic_datekit_referrals",
-        "organic_budgetkit_referrals",
-        "organic_healthkit_referrals",
-        "organic_sleepkit_referrals",
-        "organic_focuskit_referrals",
-        "organic_opskit_referrals",
-        "organic_studykit_referrals",
-        "organic_careerkit_referrals",
-        "organic_housingkit_referrals",
-        "organic_taxkit_referrals",
-        "organic_other_referrals",
-        "organic_non_bot_homepage_referrals",
-        "organic_non_bot_blog_referrals",
-        "organic_non_bot_tools_referrals",
-        "organic_non_bot_cheatsheets_referrals",
-        "organic_non_bot_datekit_referrals",
-        "organic_non_bot_budgetkit_referrals",
-        "organic_non_bot_healthkit_referrals",
-        "organic_non_bot_sleepkit_referrals",
-        "organic_non_bot_focuskit_referrals",
-        "organic_non_bot_opskit_referrals",
-        "organic_non_bot_studykit_referrals",
-        "organic_non_bot_careerkit_referrals",
-        "organic_non_bot_housingkit_referrals",
-        "organic_non_bot_taxkit_referrals",
-        "organic_non_bot_other_referrals",
-    ]
     deltas = {}
-    for metric in metrics:
+    for metric in COMPARISON_METRICS:
         current_value = int(current_summary.get(metric, 0))
         previous_value = int(previous_summary.get(metric, 0))
         deltas[metric] = current_value - previous_value
@@ -1629,603 +1828,63 @@ def build_window_comparison(
     }
 
 
-def parse_args():
-    parser = argparse.ArgumentParser(description="Analyze web-ceo nginx access logs.")
-    parser.add_argument("--hours", type=int, default=24, help="Rolling time window in hours (default: 24)")
-    parser.add_argument("--max-items", type=int, default=20, help="Max rows per printed section (default: 20)")
-    parser.add_argument(
-        "--compare-previous",
-        action="store_true",
-        help="Compare current window with the previous window of the same duration",
-    )
-    parser.add_argument("--json", type=str, default="", help="Write JSON output to this file")
-    return parser.parse_args()
-
-
-def main():
-    args = parse_args()
-    now = datetime.now(timezone.utc)
-    window_hours = max(1, args.hours)
-    current_start = now - timedelta(hours=window_hours)
-    previous_start = current_start - timedelta(hours=window_hours)
-
-    current_window = WindowStats()
-    previous_window = WindowStats() if args.compare_previous else None
-    events: list[tuple[datetime, str, str, str, str, str, str]] = []
-
-    for logfile in LOG_FILES:
-        try:
-            lines = read_log_lines(logfile)
-        except Exception as exc:
-            print(f"Error reading {logfile}: {exc}", file=sys.stderr)
-            continue
-
-        for line in lines:
-            match = LOG_PATTERN.match(line)
-            if not match:
-                continue
-
-            try:
-                ts = datetime.strptime(match.group("ts"), "%d/%b/%Y:%H:%M:%S %z").astimezone(timezone.utc)
-            except ValueError:
-                continue
-
-            if args.compare_previous:
-                if ts < previous_start:
-                    continue
-            else:
-                if ts < current_start:
-                    continue
-
-            ip = match.group("ip")
-            status = match.group("status")
-            referrer = match.group("ref").strip()
-            user_agent = match.group("ua").strip()
-            path, query = parse_request_path_query(match.group("req"))
-            events.append((ts, ip, status, referrer, path, query, user_agent))
-
-    events.sort(key=lambda item: item[0])
-
-    for ts, ip, status, referrer, path, query, user_agent in events:
-        if args.compare_previous:
-            target_window = current_window if ts >= current_start else previous_window
-        else:
-            target_window = current_window
-        if target_window is None:
-            continue
-        target_window.record(ip, status, referrer, path, query, user_agent, ts)
+def print_ranked_section(title: str, items, format_row):
+    print(f"=== {title} ===")
+    for key, count in items:
+        print(format_row(key, count))
 
-    generated_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
-    summary = current_window.summary(generated_at, window_hours)
-    comparison = None
-    if args.compare_previous and previous_window is not None:
-        previous_summary = previous_window.summary(current_start.strftime("%Y-%m-%dT%H:%M:%SZ"), window_hours)
-        comparison = build_window_comparison(summary, previous_summary, current_start, now, previous_start)
 
-    print(f"=== TRAFFIC SUMMARY (last {summary['window_hours']}h) ===")
-    print(f"  total_requests: {summary['total_requests']}")
-    print(f"  unique_ips: {summary['unique_ips']}")
-    print(f"  clean_requests: {summary['clean_requests']}")
-    print(f"  clean_unique_ips: {summary['clean_unique_ips']}")
-    print(f"  content_requests: {summary['content_requests']}")
-    print(f"  content_unique_ips: {summary['content_unique_ips']}")
-    print(f"  suspicious_requests: {summary['suspicious_requests']}")
-    print(f"  not_found_requests: {summary['not_found_requests']}")
-    print(f"  suspicious_404: {summary['suspicious_404']}")
-    print(f"  organic_referrals: {summary['organic_referrals']}")
-    print(f"  organic_non_bot_referrals: {summary['organic_non_bot_referrals']}")
-    print(f"  organic_kit_referrals: {summary['organic_kit_referrals']}")
-    print(f"  organic_non_bot_kit_referrals: {summary['organic_non_bot_kit_referrals']}")
-    print(f"  crosspromo_campaign_hits: {summary['crosspromo_campaign_hits']}")
-    print(f"  crosspromo_campaign_hits_to_datekit: {summary['crosspromo_campaign_hits_to_datekit']}")
-    print(f"  crosspromo_campaign_hits_to_budgetkit: {summary['crosspromo_campaign_hits_to_budgetkit']}")
-    print(f"  crosspromo_campaign_hits_to_healthkit: {summary['crosspromo_campaign_hits_to_healthkit']}")
-    print(f"  crosspromo_campaign_hits_to_sleepkit: {summary['crosspromo_campaign_hits_to_sleepkit']}")
-    print(f"  crosspromo_campaign_hits_to_focuskit: {summary['crosspromo_campaign_hits_to_focuskit']}")
-    print(f"  crosspromo_campaign_hits_to_opskit: {summary['crosspromo_campaign_hits_to_opskit']}")
-    print(f"  crosspromo_campaign_hits_to_studykit: {summary['crosspromo_campaign_hits_to_studykit']}")
-    print(f"  crosspromo_campaign_hits_to_careerkit: {summary['crosspromo_campaign_hits_to_careerkit']}")
-    print(f"  crosspromo_campaign_hits_to_housingkit: {summary['crosspromo_campaign_hits_to_housingkit']}")
-    print(f"  crosspromo_campaign_hits_to_taxkit: {summary['crosspromo_campaign_hits_to_taxkit']}")
-    print(f"  crosspromo_non_bot_hits_to_datekit: {summary['crosspromo_non_bot_hits_to_datekit']}")
-    print(f"  crosspromo_non_bot_hits_to_budgetkit: {summary['crosspromo_non_bot_hits_to_budgetkit']}")
-    print(f"  crosspromo_non_bot_hits_to_healthkit: {summary['crosspromo_non_bot_hits_to_healthkit']}")
-    print(f"  crosspromo_non_bot_hits_to_sleepkit: {summary['crosspromo_non_bot_hits_to_sleepkit']}")
-    print(f"  crosspromo_non_bot_hits_to_focuskit: {summary['crosspromo_non_bot_hits_to_focuskit']}")
-    print(f"  crosspromo_non_bot_hits_to_opskit: {summary['crosspromo_non_bot_hits_to_opskit']}")
-    print(f"  crosspromo_non_bot_hits_to_studykit: {summary['crosspromo_non_bot_hits_to_studykit']}")
-    print(f"  crosspromo_non_bot_hits_to_careerkit: {summary['crosspromo_non_bot_hits_to_careerkit']}")
-    print(f"  crosspromo_non_bot_hits_to_housingkit: {summary['crosspromo_non_bot_hits_to_housingkit']}")
-    print(f"  crosspromo_non_bot_hits_to_taxkit: {summary['crosspromo_non_bot_hits_to_taxkit']}")
-    print(f"  crosspromo_source_attributed_hits: {summary['crosspromo_source_attributed_hits']}")
-    print(f"  crosspromo_non_bot_source_attributed_hits: {summary['crosspromo_non_bot_source_attributed_hits']}")
-    print(f"  crosspromo_hits_with_param_source: {summary['crosspromo_hits_with_param_source']}")
-    print(f"  crosspromo_non_bot_hits_with_param_source: {summary['crosspromo_non_bot_hits_with_param_source']}")
-    print(
-        "  crosspromo_hits_with_param_source_without_referrer: "
-        f"{summary['crosspromo_hits_with_param_source_without_referrer']}"
-    )
-    print(
-        "  crosspromo_non_bot_hits_with_param_source_without_referrer: "
-        f"{summary['crosspromo_non_bot_hits_with_param_source_without_referrer']}"
-    )
-    print(f"  crosspromo_hits_with_internal_referrer: {summary['crosspromo_hits_with_internal_referrer']}")
-    print(f"  crosspromo_hits_with_inferred_source: {summary['crosspromo_hits_with_inferred_source']}")
-    print(f"  crosspromo_inferred_verified_hits: {summary['crosspromo_inferred_verified_hits']}")
-    print(f"  crosspromo_inferred_unverified_hits: {summary['crosspromo_inferred_unverified_hits']}")
-    print(f"  crosspromo_hits_unattributed: {summary['crosspromo_hits_unattributed']}")
-    print(f"  crosspromo_non_bot_hits_with_internal_referrer: {summary['crosspromo_non_bot_hits_with_internal_referrer']}")
-    print(f"  crosspromo_non_bot_hits_with_inferred_source: {summary['crosspromo_non_bot_hits_with_inferred_source']}")
-    print(f"  crosspromo_non_bot_inferred_verified_hits: {summary['crosspromo_non_bot_inferred_verified_hits']}")
-    print(f"  crosspromo_non_bot_inferred_unverified_hits: {summary['crosspromo_non_bot_inferred_unverified_hits']}")
-    print(f"  crosspromo_non_bot_hits_unattributed: {summary['crosspromo_non_bot_hits_unattributed']}")
-    print(f"  crosspromo_hits_with_any_referrer: {summary['crosspromo_hits_with_any_referrer']}")
-    print(f"  crosspromo_hits_without_referrer: {summary['crosspromo_hits_without_referrer']}")
-    print(f"  crosspromo_non_bot_hits_with_any_referrer: {summary['crosspromo_non_bot_hits_with_any_referrer']}")
-    print(f"  crosspromo_non_bot_hits_without_referrer: {summary['crosspromo_non_bot_hits_without_referrer']}")
-    print(f"  crosspromo_hits_without_referrer_known_bot: {summary['crosspromo_hits_without_referrer_known_bot']}")
-    print(f"  crosspromo_hits_without_referrer_non_bot: {summary['crosspromo_hits_without_referrer_non_bot']}")
-    print(f"  crosspromo_known_bot_hits: {summary['crosspromo_known_bot_hits']}")
-    print(f"  crosspromo_non_bot_hits: {summary['crosspromo_non_bot_hits']}")
-    print(f"  crosspromo_non_bot_high_confidence_hits: {summary['crosspromo_non_bot_high_confidence_hits']}")
-    print(f"  crosspromo_non_bot_low_confidence_hits: {summary['crosspromo_non_bot_low_confidence_hits']}")
-    print(f"  crosspromo_suspected_automation_hits: {summary['crosspromo_suspected_automation_hits']}")
-    print(f"  crosspromo_suspected_automation_unique_ips: {summary['crosspromo_suspected_automation_unique_ips']}")
-    print(f"  crosspromo_source_mismatch_hits: {summary['crosspromo_source_mismatch_hits']}")
-    print(f"  internal_crossproperty_referrals: {summary['internal_crossproperty_referrals']}")
-    print(f"  internal_crossproperty_non_bot_referrals: {summary['internal_crossproperty_non_bot_referrals']}")
-    print(f"  internal_crossproperty_inferred_referrals: {summary['internal_crossproperty_inferred_referrals']}")
-    print(f"  internal_crossproperty_inferred_non_bot_referrals: {summary['internal_crossproperty_inferred_non_bot_referrals']}")
-    print(f"  internal_crossproperty_inferred_verified_referrals: {summary['internal_crossproperty_inferred_verified_referrals']}")
-    print(
-        "  internal_crossproperty_inferred_non_bot_verified_referrals: "
-        f"{summary['internal_crossproperty_inferred_non_bot_verified_referrals']}"
-    )
-    print(f"  internal_crossproperty_inferred_unverified_referrals: {summary['internal_crossproperty_inferred_unverified_referrals']}")
-    print(
-        "  internal_crossproperty_inferred_non_bot_unverified_referrals: "
-        f"{summary['internal_crossproperty_inferred_non_bot_unverified_referrals']}"
-    )
-    print(f"  internal_crossproperty_effective_referrals: {summary['internal_crossproperty_effective_referrals']}")
-    print(f"  internal_crossproperty_effective_non_bot_referrals: {summary['internal_crossproperty_effective_non_bot_referrals']}")
-    print(
-        "  internal_crossproperty_high_confidence_non_bot_referrals: "
-        f"{summary['internal_crossproperty_high_confidence_non_bot_referrals']}"
-    )
-    print(
-        "  internal_crossproperty_low_confidence_non_bot_referrals: "
-        f"{summary['internal_crossproperty_low_confidence_non_bot_referrals']}"
-    )
-    print(f"  known_bot_requests: {summary['known_bot_requests']}")
-    print(f"  known_bot_unique_ips: {summary['known_bot_unique_ips']}")
-    print(f"  top_organic_non_bot_section: {summary['top_organic_non_bot_section']}")
-    print(f"  top_organic_non_bot_page: {summary['top_organic_non_bot_page']}")
-    print(f"  top_organic_non_bot_kit_section: {summary['top_organic_non_bot_kit_section']}")
-    print(f"  top_organic_non_bot_kit_page: {summary['top_organic_non_bot_kit_page']}")
-    print(f"  top_crosspromo_campaign_source: {summary['top_crosspromo_campaign_source']}")
-    print(f"  top_crosspromo_campaign_target_section: {summary['top_crosspromo_campaign_target_section']}")
-    print(f"  top_crosspromo_campaign_source_target_section: {summary['top_crosspromo_campaign_source_target_section']}")
-    print(f"  clean_request_ratio: {summary['clean_request_ratio']}%")
-    print(f"  suspicious_request_ratio: {summary['suspicious_request_ratio']}%")
-    print(f"  known_bot_request_ratio: {summary['known_bot_request_ratio']}%")
-    print(f"  organic_referral_ratio: {summary['organic_referral_ratio']}%")
-    print(f"  organic_non_bot_referral_ratio: {summary['organic_non_bot_referral_ratio']}%")
-    print(f"  organic_non_bot_kit_referral_ratio: {summary['organic_non_bot_kit_referral_ratio']}%")
-    print(f"  internal_crossproperty_referral_ratio: {summary['internal_crossproperty_referral_ratio']}%")
-    print(f"  internal_crossproperty_non_bot_referral_ratio: {summary['internal_crossproperty_non_bot_referral_ratio']}%")
-    print(f"  internal_crossproperty_inferred_referral_ratio: {summary['internal_crossproperty_inferred_referral_ratio']}%")
-    print(
-        f"  internal_crossproperty_inferred_non_bot_referral_ratio: {summary['internal_crossproperty_inferred_non_bot_referral_ratio']}%"
-    )
-    print(f"  internal_crossproperty_effective_referral_ratio: {summary['internal_crossproperty_effective_referral_ratio']}%")
-    print(
-        f"  internal_crossproperty_effective_non_bot_referral_ratio: {summary['internal_crossproperty_effective_non_bot_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_high_confidence_non_bot_referral_ratio: "
-        f"{summary['internal_crossproperty_high_confidence_non_bot_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_low_confidence_non_bot_referral_ratio: "
-        f"{summary['internal_crossproperty_low_confidence_non_bot_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_high_confidence_non_bot_of_effective_ratio: "
-        f"{summary['internal_crossproperty_high_confidence_non_bot_of_effective_ratio']}%"
-    )
-    print(f"  crosspromo_source_attribution_ratio: {summary['crosspromo_source_attribution_ratio']}%")
-    print(f"  crosspromo_known_bot_ratio: {summary['crosspromo_known_bot_ratio']}%")
-    print(f"  crosspromo_suspected_automation_ratio: {summary['crosspromo_suspected_automation_ratio']}%")
-    print(f"  crosspromo_non_bot_source_attribution_ratio: {summary['crosspromo_non_bot_source_attribution_ratio']}%")
-    print(f"  crosspromo_non_bot_high_confidence_ratio: {summary['crosspromo_non_bot_high_confidence_ratio']}%")
-    print(f"  crosspromo_non_bot_low_confidence_ratio: {summary['crosspromo_non_bot_low_confidence_ratio']}%")
-    print(f"  crosspromo_without_referrer_ratio: {summary['crosspromo_without_referrer_ratio']}%")
-    print(f"  crosspromo_non_bot_without_referrer_ratio: {summary['crosspromo_non_bot_without_referrer_ratio']}%")
-    print(f"  crosspromo_param_source_ratio: {summary['crosspromo_param_source_ratio']}%")
-    print(f"  crosspromo_non_bot_param_source_ratio: {summary['crosspromo_non_bot_param_source_ratio']}%")
-    print(
-        "  crosspromo_param_source_without_referrer_ratio: "
-        f"{summary['crosspromo_param_source_without_referrer_ratio']}%"
-    )
-    print(
-        "  crosspromo_non_bot_param_source_without_referrer_ratio: "
-        f"{summary['crosspromo_non_bot_param_source_without_referrer_ratio']}%"
-    )
-    print(f"  crosspromo_inferred_verification_ratio: {summary['crosspromo_inferred_verification_ratio']}%")
-    print(
-        "  crosspromo_non_bot_inferred_verification_ratio: "
-        f"{summary['crosspromo_non_bot_inferred_verification_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_inferred_verified_referral_ratio: "
-        f"{summary['internal_crossproperty_inferred_verified_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_inferred_non_bot_verified_referral_ratio: "
-        f"{summary['internal_crossproperty_inferred_non_bot_verified_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_inferred_unverified_referral_ratio: "
-        f"{summary['internal_crossproperty_inferred_unverified_referral_ratio']}%"
-    )
-    print(
-        "  internal_crossproperty_inferred_non_bot_unverified_referral_ratio: "
-        f"{summary['internal_crossproperty_inferred_non_bot_unverified_referral_ratio']}%"
-    )
-    print()
+def print_report(
+    summary: dict,
+    comparison: dict | None,
+    current_window: WindowStats,
+    ranked: dict,
+    max_items: int,
+):
+    if max_items < 0:
+        # A negative limit prints no rows, while the JSON report keeps every entry.
+        ranked = dict.fromkeys(ranked, ())
+    print(SUMMARY_REPORT_TEMPLATE.format_map(summary))
 
     print("=== CONTENT SECTION BREAKDOWN (clean, non-asset) ===")
-    for section_name in CONTENT_SECTION_NAMES:
-        section_count = summary.get(f"content_{section_name}_requests", 0)
-        section_share = summary.get("content_section_share_pct", {}).get(section_name, 0)
+    section_shares = summary["content_section_share_pct"]
+    for section_name, content_key, _, _ in SECTION_SUMMARY_KEYS:
+        section_count = summary[content_key]
+        section_share = section_shares[section_name]
         print(f"  {section_name}: {section_count} ({section_share}%)")
     print()
 
     print("=== ORGANIC SECTION BREAKDOWN ===")
-    for section_name in CONTENT_SECTION_NAMES:
-        section_count = summary.get(f"organic_{section_name}_referrals", 0)
-        section_share = summary.get("organic_section_share_pct", {}).get(section_name, 0)
+    section_shares = summary["organic_section_share_pct"]
+    for section_name, _, organic_key, _ in SECTION_SUMMARY_KEYS:
+        section_count = summary[organic_key]
+        section_share = section_shares[section_name]
         print(f"  {section_name}: {section_count} ({section_share}%)")
     print()
 
     print("=== ORGANIC NON-BOT SECTION BREAKDOWN ===")
-    for section_name in CONTENT_SECTION_NAMES:
-        section_count = summary.get(f"organic_non_bot_{section_name}_referrals", 0)
-        section_share = summary.get("organic_non_bot_section_share_pct", {}).get(section_name, 0)
+    section_shares = summary["organic_non_bot_section_share_pct"]
+    for section_name, _, _, organic_non_bot_key in SECTION_SUMMARY_KEYS:
+        section_count = summary[organic_non_bot_key]
+        section_share = section_shares[section_name]
         print(f"  {section_name}: {section_count} ({section_share}%)")
     print()
 
     if comparison:
         print("=== WINDOW COMPARISON (current vs previous same-duration window) ===")
-        for metric in [
-            "total_requests",
-            "unique_ips",
-            "content_requests",
-            "content_blog_requests",
-            "content_tools_requests",
-            "content_cheatsheets_requests",
-            "content_datekit_requests",
-            "content_budgetkit_requests",
-            "content_healthkit_requests",
-            "content_sleepkit_requests",
-            "content_focuskit_requests",
-            "content_opskit_requests",
-            "content_studykit_requests",
-            "content_careerkit_requests",
-            "content_housingkit_requests",
-            "content_taxkit_requests",
-            "suspicious_requests",
-            "not_found_requests",
-            "organic_referrals",
-            "organic_non_bot_referrals",
-            "organic_kit_referrals",
-            "organic_non_bot_kit_referrals",
-            "organic_blog_referrals",
-            "organic_tools_referrals",
-            "organic_cheatsheets_referrals",
-            "organic_datekit_referrals",
-            "organic_budgetkit_referrals",
-            "organic_healthkit_referrals",
-            "organic_sleepkit_referrals",
-            "organic_focuskit_referrals",
-            "organic_opskit_referrals",
-            "organic_studykit_referrals",
-            "organic_careerkit_referrals",
-            "organic_housingkit_referrals",
-            "organic_taxkit_referrals",
-            "organic_non_bot_blog_referrals",
-            "organic_non_bot_tools_referrals",
-            "organic_non_bot_cheatsheets_referrals",
-            "organic_non_bot_datekit_referrals",
-            "organic_non_bot_budgetkit_referrals",
-            "organic_non_bot_healthkit_referrals",
-            "organic_non_bot_sleepkit_referrals",
-            "organic_non_bot_focuskit_referrals",
-            "organic_non_bot_opskit_referrals",
-            "organic_non_bot_studykit_referrals",
-            "organic_non_bot_careerkit_referrals",
-            "organic_non_bot_housingkit_referrals",
-            "organic_non_bot_taxkit_referrals",
-            "crosspromo_campaign_hits",
-            "crosspromo_campaign_hits_to_datekit",
-            "crosspromo_campaign_hits_to_budgetkit",
-            "crosspromo_campaign_hits_to_healthkit",
-            "crosspromo_campaign_hits_to_sleepkit",
-            "crosspromo_campaign_hits_to_focuskit",
-            "crosspromo_campaign_hits_to_opskit",
-            "crosspromo_campaign_hits_to_studykit",
-            "crosspromo_campaign_hits_to_careerkit",
-            "crosspromo_campaign_hits_to_housingkit",
-            "crosspromo_campaign_hits_to_taxkit",
-            "crosspromo_non_bot_hits_to_datekit",
-            "crosspromo_non_bot_hits_to_budgetkit",
-            "crosspromo_non_bot_hits_to_healthkit",
-            "crosspromo_non_bot_hits_to_sleepkit",
-            "crosspromo_non_bot_hits_to_focuskit",
-            "crosspromo_non_bot_hits_to_opskit",
-            "crosspromo_non_bot_hits_to_studykit",
-            "crosspromo_non_bot_hits_to_careerkit",
-            "crosspromo_non_bot_hits_to_housingkit",
-            "crosspromo_non_bot_hits_to_taxkit",
-            "crosspromo_source_attributed_hits",
-            "crosspromo_non_bot_source_attributed_hits",
-            "crosspromo_hits_with_param_source",
-            "crosspromo_non_bot_hits_with_param_source",
-            "crosspromo_hits_with_param_source_without_referrer",
-            "crosspromo_non_bot_hits_with_param_source_without_referrer",
-            "crosspromo_hits_with_internal_referrer",
-            "crosspromo_hits_with_inferred_source",
-            "crosspromo_inferred_verified_hits",
-            "crosspromo_inferred_unverified_hits",
-            "crosspromo_hits_unattributed",
-            "crosspromo_non_bot_hits_with_internal_referrer",
-            "crosspromo_non_bot_hits_with_inferred_source",
-            "crosspromo_non_bot_inferred_verified_hits",
-            "crosspromo_non_bot_inferred_unverified_hits",
-            "crosspromo_non_bot_hits_unattributed",
-            "crosspromo_hits_with_any_referrer",
-            "crosspromo_hits_without_referrer",
-            "crosspromo_non_bot_hits_with_any_referrer",
-            "crosspromo_non_bot_hits_without_referrer",
-            "crosspromo_hits_without_referrer_known_bot",
-            "crosspromo_hits_without_referrer_non_bot",
-            "crosspromo_known_bot_hits",
-            "crosspromo_non_bot_hits",
-            "crosspromo_non_bot_high_confidence_hits",
-            "crosspromo_non_bot_low_confidence_hits",
-            "crosspromo_source_mismatch_hits",
-            "internal_crossproperty_referrals",
-            "internal_crossproperty_referrals_to_datekit",
-            "internal_crossproperty_referrals_to_budgetkit",
-            "internal_crossproperty_referrals_to_healthkit",
-            "internal_crossproperty_referrals_to_sleepkit",
-            "internal_crossproperty_referrals_to_focuskit",
-            "internal_crossproperty_referrals_to_opskit",
-            "internal_crossproperty_referrals_to_studykit",
-            "internal_crossproperty_referrals_to_careerkit",
-            "internal_crossproperty_referrals_to_housingkit",
-            "internal_crossproperty_referrals_to_taxkit",
-            "internal_crossproperty_non_bot_referrals",
-            "internal_crossproperty_non_bot_referrals_to_datekit",
-            "internal_crossproperty_non_bot_referrals_to_budgetkit",
-            "internal_crossproperty_non_bot_referrals_to_healthkit",
-            "internal_crossproperty_non_bot_referrals_to_sleepkit",
-            "internal_crossproperty_non_bot_referrals_to_focuskit",
-            "internal_crossproperty_non_bot_referrals_to_opskit",
-            "internal_crossproperty_non_bot_referrals_to_studykit",
-            "internal_crossproperty_non_bot_referrals_to_careerkit",
-            "internal_crossproperty_non_bot_referrals_to_housingkit",
-            "internal_crossproperty_non_bot_referrals_to_taxkit",
-            "internal_crossproperty_inferred_referrals",
-            "internal_crossproperty_inferred_referrals_to_datekit",
-            "internal_crossproperty_inferred_referrals_to_budgetkit",
-            "internal_crossproperty_inferred_referrals_to_healthkit",
-            "internal_crossproperty_inferred_referrals_to_sleepkit",
-            "internal_crossproperty_inferred_referrals_to_focuskit",
-            "internal_crossproperty_inferred_referrals_to_opskit",
-            "internal_crossproperty_inferred_referrals_to_studykit",
-            "internal_crossproperty_inferred_referrals_to_careerkit",
-            "internal_crossproperty_inferred_referrals_to_housingkit",
-            "internal_crossproperty_inferred_referrals_to_taxkit",
-            "internal_crossproperty_inferred_non_bot_referrals",
-            "internal_crossproperty_inferred_non_bot_referrals_to_datekit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_budgetkit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_healthkit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_sleepkit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_focuskit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_opskit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_studykit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_careerkit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_housingkit",
-            "internal_crossproperty_inferred_non_bot_referrals_to_taxkit",
-            "internal_crossproperty_inferred_verified_referrals",
-            "internal_crossproperty_inferred_non_bot_verified_referrals",
-            "internal_crossproperty_inferred_unverified_referrals",
-            "internal_crossproperty_inferred_non_bot_unverified_referrals",
-            "internal_crossproperty_effective_referrals",
-            "internal_crossproperty_effective_referrals_to_datekit",
-            "internal_crossproperty_effective_referrals_to_budgetkit",
-            "internal_crossproperty_effective_referrals_to_healthkit",
-            "internal_crossproperty_effective_referrals_to_sleepkit",
-            "internal_crossproperty_effective_referrals_to_focuskit",
-            "internal_crossproperty_effective_referrals_to_opskit",
-            "internal_crossproperty_effective_referrals_to_studykit",
-            "internal_crossproperty_effective_referrals_to_careerkit",
-            "internal_crossproperty_effective_referrals_to_housingkit",
-            "internal_crossproperty_effective_referrals_to_taxkit",
-            "internal_crossproperty_effective_non_bot_referrals",
-            "internal_crossproperty_effective_non_bot_referrals_to_datekit",
-            "internal_crossproperty_effective_non_bot_referrals_to_budgetkit",
-            "internal_crossproperty_effective_non_bot_referrals_to_healthkit",
-            "internal_crossproperty_effective_non_bot_referrals_to_sleepkit",
-            "internal_crossproperty_effective_non_bot_referrals_to_focuskit",
-            "internal_crossproperty_effective_non_bot_referrals_to_opskit",
-            "internal_crossproperty_effective_non_bot_referrals_to_studykit",
-            "internal_crossproperty_effective_non_bot_referrals_to_careerkit",
-            "internal_crossproperty_effective_non_bot_referrals_to_housingkit",
-            "internal_crossproperty_effective_non_bot_referrals_to_taxkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_datekit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_budgetkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_healthkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_sleepkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_focuskit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_opskit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_studykit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_careerkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_housingkit",
-            "internal_crossproperty_high_confidence_non_bot_referrals_to_taxkit",
-            "internal_crossproperty_low_confidence_non_bot_referrals",
-            "known_bot_requests",
-            "known_bot_unique_ips",
-        ]:
-            delta = comparison["deltas"][metric]
-            delta_pct = comparison["deltas"][f"{metric}_pct"]
+        deltas = comparison["deltas"]
+        for metric, delta, delta_pct in zip(
+            COMPARISON_REPORT_METRICS,
+            itemgetter(*COMPARISON_REPORT_METRICS)(deltas),
+            itemgetter(*COMPARISON_REPORT_PCT_KEYS)(deltas),
+        ):
             delta_pct_label = "n/a" if delta_pct is None else f"{delta_pct:+.2f}%"
             print(f"  {metric}: {delta:+d} ({delta_pct_label})")
         print()
 
-    print("=== STATUS CODES ===")
-    for code, count in current_window.status_counts.most_common(args.max_items):
-        print(f"  {code}: {count}")
-    print()
-
-    print("=== TOP PAGES (non-asset) ===")
-    for path, count in current_window.page_counts.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
-
-    print("=== ORGANIC ENGINES ===")
-    for engine, count in current_window.organic_engine_counts.most_common(args.max_items):
-        print(f"  {engine}: {count}")
-    print()
-
-    print("=== ORGANIC NON-BOT ENGINES ===")
-    for engine, count in current_window.organic_non_bot_engine_counts.most_common(args.max_items):
-        print(f"  {engine}: {count}")
-    print()
-
-    print("=== TOP ORGANIC LANDING PAGES ===")
-    for path, count in current_window.organic_page_counts.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
-
-    print("=== TOP ORGANIC NON-BOT LANDING PAGES ===")
-    for path, count in current_window.organic_non_bot_page_counts.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
-
-    print("=== TOP ORGANIC NON-BOT KIT LANDING PAGES ===")
-    organic_non_bot_kit_page_counts = Counter(
-        {
-            path: count
-            for path, count in current_window.organic_non_bot_page_counts.items()
-            if classify_content_section(path) in KIT_SECTION_NAMES
-        }
-    )
-    for path, count in organic_non_bot_kit_page_counts.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
-
-    print("=== TOP EXTERNAL REFERRERS ===")
-    for referrer, count in current_window.external_referrers.most_common(args.max_items):
-        print(f"  {count:4d}  {referrer}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN LANDINGS ===")
-    for path, count in current_window.crosspromo_campaign_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN SOURCES ===")
-    for source, count in current_window.crosspromo_campaign_sources.most_common(args.max_items):
-        print(f"  {count:4d}  {source}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN SOURCE PAGES ===")
-    for source_path, count in current_window.crosspromo_campaign_source_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {source_path}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN PARAM-SOURCE PAGES (from utm_content) ===")
-    for source_path, count in current_window.crosspromo_campaign_param_source_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {source_path}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN SOURCE SECTIONS ===")
-    for section, count in current_window.crosspromo_campaign_source_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN PARAM-SOURCE SECTIONS (from utm_content) ===")
-    for section, count in current_window.crosspromo_campaign_param_source_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN TARGET SECTIONS ===")
-    for section, count in current_window.crosspromo_campaign_target_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN SOURCE->TARGET SECTION PAIRS ===")
-    for pair, count in current_window.crosspromo_campaign_source_target_sections.most_common(args.max_items):
-        print(f"  {count:4d}  {pair}")
-    print()
-
-    print("=== CROSSPROMO CAMPAIGN SOURCE->TARGET PAGE PAIRS ===")
-    for pair, count in current_window.crosspromo_campaign_page_path_pairs.most_common(args.max_items):
-        print(f"  {count:4d}  {pair}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN SOURCES ===")
-    for source, count in current_window.crosspromo_non_bot_campaign_sources.most_common(args.max_items):
-        print(f"  {count:4d}  {source}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN SOURCE PAGES ===")
-    for source_path, count in current_window.crosspromo_non_bot_campaign_source_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {source_path}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN PARAM-SOURCE PAGES (from utm_content) ===")
-    for source_path, count in current_window.crosspromo_non_bot_campaign_param_source_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {source_path}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN SOURCE SECTIONS ===")
-    for section, count in current_window.crosspromo_non_bot_campaign_source_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN PARAM-SOURCE SECTIONS (from utm_content) ===")
-    for section, count in current_window.crosspromo_non_bot_campaign_param_source_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN TARGET SECTIONS ===")
-    for section, count in current_window.crosspromo_non_bot_campaign_target_sections.most_common(args.max_items):
-        print(f"  {section}: {count}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN SOURCE->TARGET SECTION PAIRS ===")
-    for pair, count in current_window.crosspromo_non_bot_campaign_source_target_sections.most_common(args.max_items):
-        print(f"  {count:4d}  {pair}")
-    print()
-
-    print("=== CROSSPROMO NON-BOT CAMPAIGN SOURCE->TARGET PAGE PAIRS ===")
-    for pair, count in current_window.crosspromo_non_bot_campaign_page_path_pairs.most_common(args.max_items):
-        print(f"  {count:4d}  {pair}")
-    print()
-
-    print("=== TOP CROSSPROMO KNOWN BOT USER AGENTS ===")
-    for user_agent, count in current_window.crosspromo_known_bot_user_agents.most_common(args.max_items):
-        print(f"  {count:4d}  {user_agent}")
-    print()
-
-    print("=== TOP CROSSPROMO SUSPECTED AUTOMATION USER AGENTS ===")
-    for user_agent, count in current_window.crosspromo_suspected_automation_user_agents.most_common(args.max_items):
-        print(f"  {count:4d}  {user_agent}")
-    print()
+    for title, ranked_key, format_row in REPORT_RANKED_SECTIONS:
+        print_ranked_section(title, ranked[ranked_key], format_row)
+        print()
 
     print(
         "=== INTERNAL CROSS-PROPERTY REFERRALS "
@@ -2240,19 +1899,19 @@ def main():
         f"{current_window.internal_crossproperty_referrals + current_window.internal_crossproperty_inferred_referrals}"
     )
     print("  by target section:")
-    for section, count in current_window.internal_crossproperty_target_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_target_sections"]:
         print(f"    {section}: {count}")
     print("  inferred by target section:")
-    for section, count in current_window.internal_crossproperty_inferred_target_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_inferred_target_sections"]:
         print(f"    {section}: {count}")
     print("  by source section:")
-    for section, count in current_window.internal_crossproperty_source_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_source_sections"]:
         print(f"    {section}: {count}")
     print("  top source pages:")
-    for source_path, count in current_window.internal_crossproperty_source_pages.most_common(args.max_items):
+    for source_path, count in ranked["internal_crossproperty_source_pages"]:
         print(f"    {count:4d}  {source_path}")
     print("  top target pages:")
-    for target_path, count in current_window.internal_crossproperty_target_pages.most_common(args.max_items):
+    for target_path, count in ranked["internal_crossproperty_target_pages"]:
         print(f"    {count:4d}  {target_path}")
     print("  non-bot total:")
     print(f"    {current_window.internal_crossproperty_non_bot_referrals}")
@@ -2268,221 +1927,122 @@ def main():
         f"{current_window.internal_crossproperty_non_bot_referrals + current_window.internal_crossproperty_inferred_non_bot_referrals}"
     )
     print("  non-bot by target section:")
-    for section, count in current_window.internal_crossproperty_non_bot_target_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_non_bot_target_sections"]:
         print(f"    {section}: {count}")
     print("  non-bot inferred by target section:")
-    for section, count in current_window.internal_crossproperty_inferred_non_bot_target_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_inferred_non_bot_target_sections"]:
         print(f"    {section}: {count}")
     print("  non-bot by source section:")
-    for section, count in current_window.internal_crossproperty_non_bot_source_sections.most_common(args.max_items):
+    for section, count in ranked["internal_crossproperty_non_bot_source_sections"]:
         print(f"    {section}: {count}")
     print("  non-bot top source pages:")
-    for source_path, count in current_window.internal_crossproperty_non_bot_source_pages.most_common(args.max_items):
+    for source_path, count in ranked["internal_crossproperty_non_bot_source_pages"]:
         print(f"    {count:4d}  {source_path}")
     print("  non-bot top target pages:")
-    for target_path, count in current_window.internal_crossproperty_non_bot_target_pages.most_common(args.max_items):
+    for target_path, count in ranked["internal_crossproperty_non_bot_target_pages"]:
         print(f"    {count:4d}  {target_path}")
     print()
 
-    print("=== TOP 404 PAGES ===")
-    for path, count in current_window.not_found_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
+    for title, ranked_key, format_row in REPORT_NOT_FOUND_SECTIONS:
+        print_ranked_section(title, ranked[ranked_key], format_row)
+        print()
 
-    print("=== TOP CLEAN 404 PAGES ===")
-    for path, count in current_window.clean_not_found_pages.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
-    print()
+    print_ranked_section("TOP SUSPICIOUS PATHS", ranked["top_suspicious_paths"], REPORT_ROW_COUNT_FIRST)
 
-    print("=== TOP SUSPICIOUS PATHS ===")
-    for path, count in current_window.suspicious_paths.most_common(args.max_items):
-        print(f"  {count:4d}  {path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze web-ceo nginx access logs.")
+    parser.add_argument("--hours", type=int, default=24, help="Rolling time window in hours (default: 24)")
+    parser.add_argument("--max-items", type=int, default=20, help="Max rows per printed section (default: 20)")
+    parser.add_argument(
+        "--compare-previous",
+        action="store_true",
+        help="Compare current window with the previous window of the same duration",
+    )
+    parser.add_argument("--json", type=str, default="", help="Write JSON output to this file")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for log parsing (default: 1)")
+    parser.add_argument("--quiet", action="store_true", help="Skip the text report, e.g. when only --json is wanted")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    now = datetime.now(timezone.utc)
+    window_hours = max(1, args.hours)
+    current_start = now - timedelta(hours=window_hours)
+    previous_start = current_start - timedelta(hours=window_hours)
+
+    current_window = WindowStats()
+    previous_window = WindowStats() if args.compare_previous else None
+    events: list[tuple[int, str, str, str, str, str, str]] = []
+    earliest_start = previous_start if args.compare_previous else current_start
+    current_start_epoch = epoch_seconds(current_start)
+
+    with multiprocessing.Pool(args.jobs) if args.jobs > 1 else contextlib.nullcontext() as pool:
+        for logfile in LOG_FILES:
+            try:
+                if pool is None:
+                    events.extend(parse_log_events(read_log_lines(logfile), earliest_start))
+                else:
+                    events.extend(parse_log_events_in_pool(pool, read_log_lines(logfile), earliest_start, args.jobs * 2))
+            except (OSError, UnicodeDecodeError, subprocess.CalledProcessError) as exc:
+                print(f"Error reading {logfile}: {exc}", file=sys.stderr)
+
+    events.sort(key=itemgetter(0))
+
+    for ts, ip, status, referrer, path, query, user_agent in events:
+        if args.compare_previous:
+            target_window = current_window if ts >= current_start_epoch else previous_window
+        else:
+            target_window = current_window
+        if target_window is None:
+            continue
+        target_window.record(ip, status, referrer, path, query, user_agent, ts)
+
+    generated_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    summary = current_window.summary(generated_at, window_hours)
+    comparison = None
+    if args.compare_previous and previous_window is not None:
+        previous_summary = previous_window.summary(current_start.strftime("%Y-%m-%dT%H:%M:%SZ"), window_hours)
+        comparison = build_window_comparison(summary, previous_summary, current_start, now, previous_start)
+
+    top_n = None if args.max_items < 0 else args.max_items
+    ranked = {}
+    for report_key, counts_name, key_name in REPORT_RANKED_COUNTERS:
+        counts = getattr(current_window, counts_name)
+        if key_name == "pair":
+            counts = join_pair_counts(counts)
+        ranked[report_key] = most_common(counts, top_n)
+
+    if not args.quiet:
+        report_buffer = io.StringIO()
+        with contextlib.redirect_stdout(report_buffer):
+            print_report(summary, comparison, current_window, ranked, args.max_items)
+        sys.stdout.write(report_buffer.getvalue())
+
+    if not args.json:
+        return
 
     report = {
         "summary": summary,
-        "status_codes": counter_to_sorted_list(current_window.status_counts, "code", args.max_items),
-        "content_sections": counter_to_sorted_list(current_window.content_section_counts, "section", args.max_items),
-        "organic_sections": counter_to_sorted_list(current_window.organic_section_counts, "section", args.max_items),
-        "organic_non_bot_sections": counter_to_sorted_list(current_window.organic_non_bot_section_counts, "section", args.max_items),
-        "top_pages": counter_to_sorted_list(current_window.page_counts, "path", args.max_items),
-        "organic_engines": counter_to_sorted_list(current_window.organic_engine_counts, "engine", args.max_items),
-        "organic_non_bot_engines": counter_to_sorted_list(
-            current_window.organic_non_bot_engine_counts,
-            "engine",
-            args.max_items,
-        ),
-        "top_organic_pages": counter_to_sorted_list(current_window.organic_page_counts, "path", args.max_items),
-        "top_organic_non_bot_pages": counter_to_sorted_list(current_window.organic_non_bot_page_counts, "path", args.max_items),
-        "top_organic_non_bot_kit_pages": counter_to_sorted_list(organic_non_bot_kit_page_counts, "path", args.max_items),
-        "top_external_referrers": counter_to_sorted_list(current_window.external_referrers, "referrer", args.max_items),
-        "crosspromo_campaign_pages": counter_to_sorted_list(current_window.crosspromo_campaign_pages, "path", args.max_items),
-        "crosspromo_campaign_sources": counter_to_sorted_list(current_window.crosspromo_campaign_sources, "source", args.max_items),
-        "crosspromo_campaign_source_pages": counter_to_sorted_list(
-            current_window.crosspromo_campaign_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "crosspromo_campaign_param_source_pages": counter_to_sorted_list(
-            current_window.crosspromo_campaign_param_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "crosspromo_campaign_source_sections": counter_to_sorted_list(
-            current_window.crosspromo_campaign_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_campaign_param_source_sections": counter_to_sorted_list(
-            current_window.crosspromo_campaign_param_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_campaign_target_sections": counter_to_sorted_list(
-            current_window.crosspromo_campaign_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_campaign_source_target_sections": counter_to_sorted_list(
-            current_window.crosspromo_campaign_source_target_sections,
-            "pair",
-            args.max_items,
-        ),
-        "crosspromo_campaign_page_path_pairs": counter_to_sorted_list(
-            current_window.crosspromo_campaign_page_path_pairs,
-            "pair",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_sources": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_sources,
-            "source",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_source_pages": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_param_source_pages": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_param_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_source_sections": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_param_source_sections": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_param_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_target_sections": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_source_target_sections": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_source_target_sections,
-            "pair",
-            args.max_items,
-        ),
-        "crosspromo_non_bot_campaign_page_path_pairs": counter_to_sorted_list(
-            current_window.crosspromo_non_bot_campaign_page_path_pairs,
-            "pair",
-            args.max_items,
-        ),
-        "crosspromo_known_bot_user_agents": counter_to_sorted_list(
-            current_window.crosspromo_known_bot_user_agents,
-            "user_agent",
-            args.max_items,
-        ),
-        "crosspromo_suspected_automation_user_agents": counter_to_sorted_list(
-            current_window.crosspromo_suspected_automation_user_agents,
-            "user_agent",
-            args.max_items,
-        ),
-        "internal_crossproperty_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_source_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_source_pages": counter_to_sorted_list(
-            current_window.internal_crossproperty_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "internal_crossproperty_target_pages": counter_to_sorted_list(
-            current_window.internal_crossproperty_target_pages,
-            "path",
-            args.max_items,
-        ),
-        "internal_crossproperty_non_bot_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_non_bot_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_non_bot_source_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_non_bot_source_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_non_bot_source_pages": counter_to_sorted_list(
-            current_window.internal_crossproperty_non_bot_source_pages,
-            "path",
-            args.max_items,
-        ),
-        "internal_crossproperty_non_bot_target_pages": counter_to_sorted_list(
-            current_window.internal_crossproperty_non_bot_target_pages,
-            "path",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_non_bot_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_non_bot_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_verified_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_verified_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_non_bot_verified_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_non_bot_verified_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_unverified_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_unverified_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "internal_crossproperty_inferred_non_bot_unverified_target_sections": counter_to_sorted_list(
-            current_window.internal_crossproperty_inferred_non_bot_unverified_target_sections,
-            "section",
-            args.max_items,
-        ),
-        "top_404_pages": counter_to_sorted_list(current_window.not_found_pages, "path", args.max_items),
-        "top_clean_404_pages": counter_to_sorted_list(current_window.clean_not_found_pages, "path", args.max_items),
-        "top_suspicious_paths": counter_to_sorted_list(current_window.suspicious_paths, "path", args.max_items),
+        **{
+            report_key: ranked_to_list(ranked[report_key], key_name)
+            for report_key, _, key_name in REPORT_RANKED_COUNTERS
+        },
     }
     if comparison:
         report["comparison"] = comparison
 
-    if args.json:
-        with open(args.json, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
-            f.write("\n")
+    if orjson is not None:
+        with open(args.json, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with open(args.json, "w", encoding="utf-8", buffering=1 << 20) as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write("\n")
 
 
 if __name__ == "__main__":
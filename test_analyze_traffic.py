@@ -0,0 +1,376 @@
+import json
+import os
+import random
+import re
+import string
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+import pytest
+
+import analyze_traffic
+from analyze_traffic import (
+    INFERRED_SOURCE_LOOKBACK_SECONDS,
+    INFERRED_SOURCE_MAX_RECENT_PATHS,
+    SUSPICIOUS_PATH_ANYWHERE_LITERALS,
+    SUSPICIOUS_PATH_PATTERNS,
+    WindowStats,
+    detect_engine,
+    is_asset_path,
+    is_known_bot_user_agent,
+    is_suspicious_path,
+    normalize_user_agent,
+    parse_log_events,
+    parse_nginx_timestamp,
+    parse_request_path_query,
+    parse_utm_content_values,
+    read_log_lines,
+)
+
+NGINX_TIMESTAMP_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
+EARLIEST_START = datetime(2026, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def log_line(raw_ts: str) -> str:
+    return f'203.0.113.7 - - [{raw_ts}] "GET /tools HTTP/1.1" 200 512 "-" "Mozilla/5.0"\n'
+
+
+def recent_log_lines(paths) -> list[str]:
+    moment = datetime.now(timezone.utc) - timedelta(minutes=5)
+    raw_ts = moment.strftime("%d/%b/%Y:%H:%M:%S +0000")
+    return [
+        f'203.0.113.{index % 7} - - [{raw_ts}] "GET {path} HTTP/1.1" 200 512 "https://www.google.com/" "Mozilla/5.0"\n'
+        for index, path in enumerate(paths)
+    ]
+
+
+def run_main(monkeypatch, capsys, tmp_path, log_lines, *args):
+    log_path = tmp_path / "access.log"
+    log_path.write_text("".join(log_lines), encoding="utf-8")
+    json_path = tmp_path / "report.json"
+    monkeypatch.setattr(analyze_traffic, "LOG_FILES", [str(log_path)])
+    monkeypatch.setattr(sys, "argv", ["analyze_traffic.py", "--json", str(json_path), *args])
+    capsys.readouterr()
+    analyze_traffic.main()
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    return capsys.readouterr().out, report
+
+
+@pytest.mark.parametrize(
+    ("request_line", "expected"),
+    [
+        ("GET /tools?q=1 HTTP/1.1", ("/tools", "q=1")),
+        ("GET  /blog/ HTTP/1.1", ("/blog", "")),
+        ("GET\t/x HTTP/1.1", ("/x", "")),
+        ("GET /blog\t/ HTTP/1.1", ("/blog", "")),
+        ("GET /tools?q=1\tHTTP/1.1", ("/tools", "q=1")),
+        ("GET /x\x0bHTTP/1.1", ("/x", "")),
+        ("GET\xa0/x HTTP/1.1", ("/x", "")),
+        ("GET /x\u3000HTTP/1.1", ("/x", "")),
+        ("GET", ("", "")),
+    ],
+)
+def test_parse_request_path_query_splits_on_any_whitespace(request_line, expected):
+    assert parse_request_path_query(request_line) == expected
+
+
+@pytest.mark.parametrize(
+    ("raw_ts", "kept"),
+    [
+        ("15/Mar/2026:12:00:00 +0000", True),
+        ("15/Mar/2026:11:59:59 +0000", False),
+        ("15/Mar/2026:12:00:01 +0000", True),
+        ("28/Feb/2026:23:59:59 +0000", False),
+        ("01/Apr/2026:00:00:00 +0000", True),
+        ("31/Dec/2025:23:59:59 +0000", False),
+        ("16/Mar/2025:12:00:00 +0000", False),
+        ("15/Mar/2026:13:30:00 +0200", False),
+        ("15/Mar/2026:11:30:00 -0100", True),
+        ("15/Mar/2026:12:00:00  +0000", True),
+        ("15/Mar/2026:11:00:00  +0000", False),
+        ("15/Mar/2026:9:00:00 +0000", False),
+        ("16/Mar/2026:9:00:00 +0000", True),
+        ("31/Feb/2026:12:00:00 +0000", False),
+        ("16/Mar/2026:12:00:00 +2400", False),
+    ],
+)
+def test_parse_log_events_keeps_lines_from_window_start(raw_ts, kept):
+    events = parse_log_events([log_line(raw_ts)], EARLIEST_START)
+    assert len(events) == kept
+    if kept:
+        assert events[0][0] == int(datetime.strptime(raw_ts, NGINX_TIMESTAMP_FORMAT).timestamp())
+
+
+@pytest.mark.parametrize(
+    "raw_ts",
+    [
+        "15/Mar/2026:12:34:56 +0000",
+        "01/Jan/1970:00:00:00 +0000",
+        "29/Feb/2024:23:59:59 -0700",
+        "31/Dec/2025:23:30:00 +0530",
+        "01/Jan/2026:00:15:00 +0545",
+        "15/Jun/2026:08:00:00 -0930",
+        "15/Jun/2026:08:00:00 -0330",
+    ],
+)
+def test_parse_nginx_timestamp_matches_strptime(raw_ts):
+    assert parse_nginx_timestamp(raw_ts) == int(datetime.strptime(raw_ts, NGINX_TIMESTAMP_FORMAT).timestamp())
+
+
+@pytest.mark.parametrize("raw_ts", ["31/Feb/2026:12:00:00 +0000", "15/Mar/2026:12:00:00 +2400"])
+def test_parse_nginx_timestamp_rejects_invalid_values(raw_ts):
+    with pytest.raises(ValueError):
+        parse_nginx_timestamp(raw_ts)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "utm_content=",
+        "utm_content=hero",
+        "utm%5Fcontent=x",
+        "utm+content=x",
+        "utm_content=a&utm_content=b",
+        "utm_content=a&utm_content=&utm_content=b",
+        "utm_content=%zz",
+        "utm_content=a+b%2Fc",
+        "utm_content",
+        "utm_content&utm_content=a",
+        "utm_source=x&utm_campaign=y",
+        "",
+    ],
+)
+def test_parse_utm_content_values_matches_parse_qs(query):
+    assert parse_utm_content_values(query) == parse_qs(query).get("utm_content", [])
+
+
+def suspicious_path_corpus() -> list[str]:
+    prefixes = ("", "/x", "/vendor", "/blog", "/lib", "/app", "/.well-known", "/WP-ADMIN")
+    names = (
+        "wp-admin",
+        "wp-login.php",
+        "phpunit/",
+        "phpinfo",
+        "PHPInfo",
+        "php-info",
+        "pinfo.x",
+        "info",
+        ".env",
+        ".env.local",
+        ".ENV",
+        ".git/config",
+        ".GİT/config",
+        "%7C_x",
+        "|_x",
+        "index.php5",
+        "a.phar",
+        "shell",
+        "ſhell",
+        "config",
+        "config.yml",
+        "settings.py",
+        "backup.sql",
+        "bac\u212aup.sql",
+        "debug.log",
+        "db.json",
+        "_next",
+        "tools",
+        "datekit",
+        "sitemap.xml",
+    )
+    suffixes = ("", "/", ".bak", "~", "/x", ".php")
+    corpus = [f"{prefix}/{name}{suffix}" for prefix in prefixes for name in names for suffix in suffixes]
+    rng = random.Random(0)
+    alphabet = "/.-_|%7cCphPinfoenvgtſİ"
+    corpus.extend("/" + "".join(rng.choices(alphabet, k=rng.randint(1, 12))) for _ in range(5000))
+    return corpus
+
+
+def test_is_suspicious_path_agrees_with_the_patterns():
+    corpus = suspicious_path_corpus()
+    flagged = 0
+    for path in corpus:
+        expected = any(pattern.search(path) for pattern in SUSPICIOUS_PATH_PATTERNS)
+        assert is_suspicious_path(path) is expected, path
+        flagged += expected
+    assert 0 < flagged < len(corpus)
+
+
+def test_suspicious_anywhere_literals_are_case_fold_safe():
+    # IGNORECASE lets a few non-ASCII characters (ſ, the Kelvin sign, İ, ı) match ASCII letters that lower() would not produce.
+    non_ascii = "".join(chr(code) for code in range(0x80, 0x110000) if not 0xD800 <= code <= 0xDFFF)
+    folded = {letter for letter in string.ascii_lowercase if re.search(letter, non_ascii, re.IGNORECASE)}
+    assert "s" in folded
+    for literal in SUSPICIOUS_PATH_ANYWHERE_LITERALS:
+        assert literal == literal.lower()
+        assert not folded & set(literal), literal
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/x.pHp", True),
+        ("/.ENV", True),
+        ("/ſhell", True),
+        ("/bac\u212aup.sql", True),
+        ("/phpİnfo", True),
+        ("/wp-admİn", True),
+        ("/x/.GİT/config", True),
+        ("/blog/İndex", False),
+        ("/ſitemap.xml", False),
+        ("/tools/\u212aelvin", False),
+    ],
+)
+def test_is_suspicious_path(path, expected):
+    assert is_suspicious_path(path) is expected
+
+
+@pytest.mark.parametrize(
+    ("user_agent", "expected"),
+    [
+        ("Mozilla ſpider", True),
+        ("Mozilla spider", True),
+        ("xbot", False),
+        ("Mozilla/5.0 (X11; Linux x86_64)", False),
+    ],
+)
+def test_is_known_bot_user_agent(user_agent, expected):
+    assert is_known_bot_user_agent(normalize_user_agent(user_agent)) is expected
+
+
+@pytest.mark.parametrize(
+    ("referrer", "expected"),
+    [
+        ("https://GOOGLE.de", "google"),
+        ("https://www.bing.com/", "bing"),
+        ("https://www.bing.com/search?q=google.com", "google"),
+        ("https://www.bing.com/search?q=google.com&lang=ſ", "google"),
+        ("-", ""),
+    ],
+)
+def test_detect_engine(referrer, expected):
+    assert detect_engine(referrer) == expected
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/a.js", True),
+        ("/a.JS", True),
+        ("/x.ſvg", True),
+        ("/a.js\n", True),
+        ("/a.jsx", False),
+        ("/x.svg.php", False),
+    ],
+)
+def test_is_asset_path(path, expected):
+    assert is_asset_path(path) is expected
+
+
+def test_read_log_lines_reads_from_fifo(tmp_path):
+    fifo = tmp_path / "access.log"
+    os.mkfifo(fifo)
+    lines = ["first\n", "second\n"]
+
+    def write_lines():
+        with open(fifo, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    writer = threading.Thread(target=write_lines)
+    writer.start()
+    try:
+        assert list(read_log_lines(str(fifo))) == lines
+    finally:
+        writer.join()
+
+
+@pytest.mark.parametrize(("max_items", "printed", "listed"), [("0", 0, 0), ("-1", 0, 3), ("2", 2, 2)])
+def test_max_items_limits_printed_rows_and_json_lists(monkeypatch, capsys, tmp_path, max_items, printed, listed):
+    paths = ["/tools", "/tools", "/tools", "/blog", "/blog", "/datekit"]
+    out, report = run_main(monkeypatch, capsys, tmp_path, recent_log_lines(paths), "--max-items", max_items)
+    page_rows = out.split("=== TOP PAGES (non-asset) ===\n")[1].partition("\n===")[0]
+    assert len(page_rows.splitlines()) == printed
+    ranked_pages = [{"path": "/tools", "count": 3}, {"path": "/blog", "count": 2}, {"path": "/datekit", "count": 1}]
+    assert report["top_pages"] == ranked_pages[:listed]
+    assert len(report["top_organic_pages"]) == listed
+
+
+def test_jobs_report_matches_serial_run(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(analyze_traffic, "PARALLEL_PARSE_BATCH_LINES", 7)
+    paths = ["/tools", "/blog/a", "/datekit", "/wp-login.php", "/blog/a", "/tools"] * 20
+    lines = recent_log_lines(paths)
+    serial_out, serial_report = run_main(monkeypatch, capsys, tmp_path, lines)
+    parallel_out, parallel_report = run_main(monkeypatch, capsys, tmp_path, lines, "--jobs", "3")
+    for report in (serial_report, parallel_report):
+        del report["summary"]["generated_at"]
+    assert parallel_report == serial_report
+    assert parallel_out == serial_out
+
+
+def test_jobs_above_cpu_count_is_kept(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(sys, "argv", ["analyze_traffic.py", "--jobs", "8"])
+    assert analyze_traffic.parse_args().jobs == 8
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_jobs_below_one_is_rejected(monkeypatch, capsys, tmp_path, jobs):
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, capsys, tmp_path, [], "--jobs", jobs)
+    assert "--jobs must be at least 1" in capsys.readouterr().err
+
+
+CLIENT = ("203.0.113.7", "Mozilla/5.0")
+
+
+def recent_entries(window: WindowStats) -> list[tuple[int, str]]:
+    timestamps, paths = window.recent_content_paths_by_client[CLIENT]
+    assert len(timestamps) == len(paths)
+    return list(zip(timestamps, paths))
+
+
+def test_recent_paths_are_kept_through_the_lookback_boundary():
+    window = WindowStats()
+    window._remember_recent_content_path(CLIENT, 1000, "/blog/a")
+    window._remember_recent_content_path(CLIENT, 1001, "/blog/b")
+    cutoff_ts = 1000 + INFERRED_SOURCE_LOOKBACK_SECONDS
+    assert window._has_recent_inferred_source_match(CLIENT, {"/blog/a"}, cutoff_ts)
+    assert recent_entries(window) == [(1000, "/blog/a"), (1001, "/blog/b")]
+    assert not window._has_recent_inferred_source_match(CLIENT, {"/blog/a"}, cutoff_ts + 1)
+    assert window._has_recent_inferred_source_match(CLIENT, {"/blog/b"}, cutoff_ts + 1)
+    assert recent_entries(window) == [(1001, "/blog/b")]
+    assert not window._has_recent_inferred_source_match(CLIENT, {"/blog/b"}, cutoff_ts + 2)
+    assert recent_entries(window) == []
+
+
+def test_remember_recent_path_trims_stale_entries_before_appending():
+    window = WindowStats()
+    window._remember_recent_content_path(CLIENT, 1000, "/blog/a")
+    window._remember_recent_content_path(CLIENT, 1500, "/blog/b")
+    window._remember_recent_content_path(CLIENT, 1500 + INFERRED_SOURCE_LOOKBACK_SECONDS, "/blog/c")
+    assert recent_entries(window) == [(1500, "/blog/b"), (1500 + INFERRED_SOURCE_LOOKBACK_SECONDS, "/blog/c")]
+
+
+def test_remember_recent_path_keeps_the_newest_entries():
+    window = WindowStats()
+    for index in range(INFERRED_SOURCE_MAX_RECENT_PATHS):
+        window._remember_recent_content_path(CLIENT, 1000 + index, f"/blog/{index}")
+    assert len(recent_entries(window)) == INFERRED_SOURCE_MAX_RECENT_PATHS
+    newest_ts = 1000 + INFERRED_SOURCE_MAX_RECENT_PATHS
+    window._remember_recent_content_path(CLIENT, newest_ts, "/blog/new")
+    entries = recent_entries(window)
+    assert len(entries) == INFERRED_SOURCE_MAX_RECENT_PATHS
+    assert entries[0] == (1001, "/blog/1")
+    assert entries[-1] == (newest_ts, "/blog/new")
+    assert not window._has_recent_inferred_source_match(CLIENT, {"/blog/0"}, newest_ts)
+    assert window._has_recent_inferred_source_match(CLIENT, {"/blog/1", "/missing"}, newest_ts)
+
+
+def test_recent_path_match_needs_known_client_and_paths():
+    window = WindowStats()
+    assert not window._has_recent_inferred_source_match(CLIENT, {"/blog/a"}, 1000)
+    window._remember_recent_content_path(CLIENT, 1000, "/blog/a")
+    assert not window._has_recent_inferred_source_match(CLIENT, set(), 1000)
+    assert not window._has_recent_inferred_source_match(("198.51.100.1", ""), {"/blog/a"}, 1000)